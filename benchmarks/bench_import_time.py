@@ -0,0 +1,107 @@
+"""
+Import-time benchmark – CLI cold start per model type.
+======================================================
+Runs each scenario in a fresh interpreter with ``-X importtime`` and
+reports wall time, total import time, whether torch/transformers got
+imported, and the heaviest top-level imports.
+
+Scenarios per model type:
+  cli      – ``run.py predict --model X`` on a gated headline (no model needed)
+  backend  – import BiasPredictor plus the backend module, without loading weights
+  model    – ``run.py predict --model X`` on a model-routed headline (needs artifacts)
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --models baseline nli --repeat 5
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODEL_TYPES = ["baseline", "nli", "onnx", "cascade", "bert"]
+GATED_HEADLINE = "Hyderabad weather forecast for tomorrow"
+MODEL_HEADLINE = "Opposition slams government over rising unemployment"
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def scenario_command(scenario: str, model_type: str) -> list:
+    if scenario in ("cli", "model"):
+        headline = GATED_HEADLINE if scenario == "cli" else MODEL_HEADLINE
+        return [str(ROOT / "run.py"), "predict", "--model", model_type, headline]
+    backend = "baseline" if model_type == "cascade" else model_type
+    code = (
+        f"import sys; sys.path.insert(0, {str(ROOT)!r}); "
+        "from src.inference.predictor import BiasPredictor; "
+        "from src.inference.backends import import_backend; "
+        f"import_backend({backend!r})"
+    )
+    return ["-c", code]
+
+
+def run_once(args: list) -> dict:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        errors = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        raise RuntimeError("\n".join(errors[-20:]))
+
+    top_level = defaultdict(int)
+    modules = set()
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        modules.add(name)
+        if indent <= 1:  # direct imports of the entry point
+            top_level[name.split(".")[0]] += cumulative
+    return {
+        "wall_s": wall,
+        "import_s": sum(top_level.values()) / 1e6,
+        "heavy": {mod: modules_in(modules, mod) for mod in ("torch", "transformers", "sklearn", "onnxruntime")},
+        "top": sorted(top_level.items(), key=lambda kv: kv[1], reverse=True)[:4],
+    }
+
+
+def modules_in(modules: set, package: str) -> bool:
+    return package in modules or any(m.startswith(package + ".") for m in modules)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", default=MODEL_TYPES, choices=MODEL_TYPES)
+    parser.add_argument("--scenarios", nargs="+", default=["cli", "backend"], choices=["cli", "backend", "model"])
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per scenario")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<18s} {'wall s':>7s} {'import s':>9s}  heavy imports / top-level")
+    for scenario in args.scenarios:
+        for model_type in args.models:
+            try:
+                runs = [run_once(scenario_command(scenario, model_type)) for _ in range(args.repeat)]
+            except RuntimeError as exc:
+                print(f"{scenario + ':' + model_type:<18s} failed: {str(exc).strip().splitlines()[-1]}")
+                continue
+            heavy = ",".join(k for k, v in runs[-1]["heavy"].items() if v) or "-"
+            top = ", ".join(f"{name} {us / 1e6:.2f}s" for name, us in runs[-1]["top"])
+            print(
+                f"{scenario + ':' + model_type:<18s} "
+                f"{statistics.median(r['wall_s'] for r in runs):>7.2f} "
+                f"{statistics.median(r['import_s'] for r in runs):>9.2f}  [{heavy}] {top}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+NLI engine benchmark – direct cross-encoder vs. zero-shot pipeline.
+===================================================================
+Scores the same model-bound headlines from the processed dataset
+through the transformers zero-shot pipeline (the previous hot path)
+and through NLIEngine, checks that the hypothesis scores agree, and
+reports per-headline latency for both.
+
+Usage:
+    python benchmarks/bench_nli_engine.py
+    python benchmarks/bench_nli_engine.py --model path/to/local/model --limit 32
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+from transformers import pipeline
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from config import NLI_HYPOTHESES, NLI_MODEL_NAME, PROCESSED_CSV
+from src.inference.nli_engine import NLIEngine
+from src.political_filter import FilterResult, PoliticalFilter
+
+
+def load_headlines(limit: int) -> list:
+    """Headlines that pass both gates, i.e. the ones the model actually sees."""
+    pf = PoliticalFilter()
+    headlines = pd.read_csv(PROCESSED_CSV)["headline"].dropna().astype(str)
+    biased = [h for h in headlines if pf.classify(h) == FilterResult.BIASED_POLITICAL]
+    return biased[:limit]
+
+
+def pipeline_scores(nli_pipeline, hypotheses: list, headline: str) -> np.ndarray:
+    """Previous hot path: one zero-shot pipeline call per headline."""
+    result = nli_pipeline(headline, candidate_labels=hypotheses, multi_label=True)
+    by_label = dict(zip(result["labels"], result["scores"]))
+    return np.array([by_label[h] for h in hypotheses])
+
+
+def timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=NLI_MODEL_NAME, help="NLI model name or local path")
+    parser.add_argument("--limit", type=int, default=64, help="Number of headlines to score")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per path")
+    args = parser.parse_args()
+
+    headlines = load_headlines(args.limit)
+    hypotheses = [h for hyps in NLI_HYPOTHESES.values() for h in hyps]
+    print(f"Scoring {len(headlines)} headlines × {len(hypotheses)} hypotheses with {args.model}")
+
+    nli_pipeline = pipeline("zero-shot-classification", model=args.model, device=-1)
+    engine = NLIEngine.from_pretrained(args.model)
+
+    # Parity: same scores as the pipeline, headline by headline
+    reference = np.stack([pipeline_scores(nli_pipeline, hypotheses, h) for h in headlines])
+    direct = np.stack([engine.score([h])[0] for h in headlines])
+    print(f"Max |score diff| vs pipeline: {np.abs(reference - direct).max():.2e}")
+
+    # Latency
+    rows = [
+        ("pipeline, per headline",
+         timed(lambda: [pipeline_scores(nli_pipeline, hypotheses, h) for h in headlines], args.repeat)),
+        ("engine, per headline",
+         timed(lambda: [engine.score([h]) for h in headlines], args.repeat)),
+        ("engine, one batch",
+         timed(lambda: engine.score(headlines), args.repeat)),
+    ]
+
+    baseline_ms = statistics.median(rows[0][1]) / len(headlines) * 1000
+    print(f"\n{'path':<24s} {'ms/headline':>12s} {'speedup':>8s}")
+    for name, samples in rows:
+        ms = statistics.median(samples) / len(headlines) * 1000
+        print(f"{name:<24s} {ms:>12.2f} {baseline_ms / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
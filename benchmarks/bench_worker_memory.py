@@ -0,0 +1,141 @@
+"""
+Worker memory benchmark – uvicorn --workers vs. the prefork server.
+===================================================================
+Starts the app with N workers in each mode, waits until it is ready and
+has served a few model requests, then reads ``/proc/<pid>/smaps_rollup``
+for every worker.
+
+RSS counts shared pages in full for every process that maps them. PSS
+splits each shared page among its sharers, so the PSS sum is the real
+memory cost of the deployment. Linux only.
+
+Modes:
+  uvicorn  – ``uvicorn src.app:app --workers N`` (each worker loads its own weights)
+  prefork  – ``run.py serve --workers N`` (weights loaded once, then fork)
+
+Usage:
+    python benchmarks/bench_worker_memory.py --workers 4
+    BIAS_NLI_MODEL=/path/to/local/model python benchmarks/bench_worker_memory.py --modes prefork
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+MODEL_HEADLINES = [
+    "Opposition slams government over rising unemployment",
+    "Prime Minister praises budget as historic for the nation",
+]
+ROLLUP_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def server_command(mode: str, workers: int, port: int) -> list:
+    if mode == "uvicorn":
+        return [
+            sys.executable, "-m", "uvicorn", "src.app:app",
+            "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port),
+        ]
+    return [
+        sys.executable, str(ROOT / "run.py"), "serve",
+        "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port),
+    ]
+
+
+def wait_ready(base_url: str, workers: int, timeout: float) -> None:
+    """Ready once /readyz answers 200 on many fresh connections in a row."""
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while streak < 4 * workers:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Server at {base_url} not ready after {timeout}s")
+        try:
+            ok = httpx.get(f"{base_url}/readyz", timeout=2).status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        streak = streak + 1 if ok else 0
+        time.sleep(0.05 if ok else 0.5)
+
+
+def children(pid: int) -> list:
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(c) for c in path.read_text().split()] if path.exists() else []
+
+
+def smaps_rollup(pid: int) -> dict:
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, _, rest = line.partition(":")
+        if name in ROLLUP_FIELDS:
+            values[name] = int(rest.split()[0]) / 1024  # kB → MiB
+    return values
+
+
+def measure(mode: str, workers: int, port: int, timeout: float) -> dict:
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        server_command(mode, workers, port), cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(base_url, workers, timeout)
+        for _ in range(4 * workers):
+            for headline in MODEL_HEADLINES:
+                httpx.post(f"{base_url}/api/predict", json={"headline": headline}, timeout=30)
+        time.sleep(1)
+
+        worker_pids = [
+            pid for pid in children(proc.pid)
+            if b"resource_tracker" not in Path(f"/proc/{pid}/cmdline").read_bytes()
+        ]
+        return {
+            "mode": mode,
+            "supervisor": smaps_rollup(proc.pid),
+            "workers": [smaps_rollup(pid) for pid in worker_pids],
+        }
+    finally:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def print_report(result: dict) -> None:
+    print(f"\n── {result['mode']} ({len(result['workers'])} workers) " + "─" * 30)
+    print(f"  {'process':<12}" + "".join(f"{f:>15}" for f in ROLLUP_FIELDS))
+    rows = [("supervisor", result["supervisor"])]
+    rows += [(f"worker {i}", w) for i, w in enumerate(result["workers"])]
+    for name, values in rows:
+        print(f"  {name:<12}" + "".join(f"{values.get(f, 0):>12.1f}MiB" for f in ROLLUP_FIELDS))
+    total_rss = sum(v["Rss"] for _, v in rows)
+    total_pss = sum(v["Pss"] for _, v in rows)
+    print(f"  total RSS {total_rss:.1f} MiB, total PSS {total_pss:.1f} MiB (real footprint)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--modes", nargs="+", choices=["uvicorn", "prefork"], default=["uvicorn", "prefork"])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds to wait for readiness")
+    parser.add_argument("--json", type=Path, help="Also write raw numbers to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("BIAS_PRELOAD_MODELS", "nli")
+    results = [measure(mode, args.workers, args.port, args.timeout) for mode in args.modes]
+    for result in results:
+        print_report(result)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Microbenchmark suite – hot-path timings with regression tracking.
+=================================================================
+Times the request hot paths on fixed inputs (the first rows of the
+processed dataset) and writes the results to JSON. ``compare`` checks
+a new results file against a stored baseline and exits non-zero when
+any benchmark got slower than the tolerance allows.
+
+Benchmarks:
+  filter_classify     PoliticalFilter.classify, per headline
+  filter_match        PoliticalFilter.match (result + matched keywords), per headline
+  filter_classify_many PoliticalFilter.classify_many on a pandas Series, per headline
+  clean_text          DataPreprocessor.clean_text, per headline
+  clean_series        DataPreprocessor.clean_series on a pandas Series, per headline
+  predict_baseline    BiasPredictor._predict_baseline, per model-bound headline
+  predict_nli         BiasPredictor._predict_nli, per model-bound headline
+  predict_nli_batch   BiasPredictor._predict_nli_batch, per headline in one batch
+  predict_end_to_end  BiasPredictor.predict (gates + model, cache off), per headline
+
+The NLI benchmarks use a tiny randomly initialised BERT cross-encoder
+built from the dataset's vocabulary (seeded, so always the same model).
+It runs offline and measures our code around the model, not DeBERTa.
+Baseline benchmarks are skipped when the TF-IDF artifacts are missing.
+
+Baselines are machine-specific, so none is committed. ``run --compare``
+against a baseline file that does not exist yet says so, saves this run
+there as the baseline and exits 0; later runs compare against it.
+``compare`` on a missing baseline is an error.
+
+Usage:
+    python benchmarks/suite.py run --compare      # first run writes benchmarks/results/baseline.json
+    # ... change code ...
+    python benchmarks/suite.py run --compare --tolerance 0.15
+    python benchmarks/suite.py compare benchmarks/results/baseline.json /tmp/current.json
+"""
+
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from config import BASELINE_MODEL, MODELS_DIR, NLI_HYPOTHESES, NLI_HYPOTHESIS_TEMPLATE, PROCESSED_CSV
+from src.data.preprocessor import DataPreprocessor
+from src.political_filter import FilterResult, PoliticalFilter
+
+TINY_MODEL_DIR = MODELS_DIR / "bench_tiny_nli"
+DEFAULT_BASELINE = ROOT / "benchmarks" / "results" / "baseline.json"
+
+
+# ── Inputs ───────────────────────────────────────────────────
+
+def load_inputs(limit: int, model_limit: int) -> tuple:
+    """First ``limit`` dataset headlines, and the first ``model_limit`` that reach the model."""
+    headlines = pd.read_csv(PROCESSED_CSV)["headline"].dropna().astype(str).tolist()[:limit]
+    pf = PoliticalFilter()
+    biased = [h for h in headlines if pf.classify(h) == FilterResult.BIASED_POLITICAL]
+    return headlines, biased[:model_limit]
+
+
+def build_tiny_model(out_dir: Path = TINY_MODEL_DIR) -> Path:
+    """A 2-layer BERT NLI stand-in (contradiction/neutral/entailment), built once."""
+    if (out_dir / "config.json").exists():
+        return out_dir
+
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+    words = set()
+    for headline in pd.read_csv(PROCESSED_CSV)["headline"].dropna().astype(str):
+        words.update(re.findall(r"\w+", headline.lower()))
+    for hypothesis in [h for hyps in NLI_HYPOTHESES.values() for h in hyps] + [NLI_HYPOTHESIS_TEMPLATE]:
+        words.update(re.findall(r"\w+", hypothesis.lower()))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(words) + list("abcdefghijklmnopqrstuvwxyz0123456789.,-|:'\"!?")
+    vocab_path = out_dir / "vocab.txt"
+    vocab_path.write_text("\n".join(dict.fromkeys(vocab)))
+    tokenizer = BertTokenizerFast(str(vocab_path), do_lower_case=True)
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(tokenizer), hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, num_labels=3,
+        id2label={0: "contradiction", 1: "neutral", 2: "entailment"},
+        label2id={"contradiction": 0, "neutral": 1, "entailment": 2},
+    )
+    BertForSequenceClassification(config).save_pretrained(out_dir)
+    tokenizer.save_pretrained(out_dir)
+    return out_dir
+
+
+def tiny_nli_predictor():
+    """BiasPredictor("nli") whose NLI backend runs the tiny stand-in model, cache off."""
+    import torch
+    from src.inference.backends.nli import NLIBackend
+    from src.inference.cache import PredictionCache
+    from src.inference.nli_engine import NLIEngine
+    from src.inference.predictor import BiasPredictor
+
+    torch.set_num_threads(1)  # steadier numbers than the machine-wide default
+    predictor = BiasPredictor("nli", cache=PredictionCache(max_entries=0))
+    predictor._backends["nli"] = NLIBackend(NLIEngine.from_pretrained(str(build_tiny_model())))
+    return predictor
+
+
+# ── Timing ───────────────────────────────────────────────────
+
+def bench(fn, items: list, repeat: int, per_call: bool = True) -> dict:
+    """
+    Median and min microseconds per item over ``repeat`` passes, after
+    one untimed warm-up pass. ``per_call`` calls ``fn`` once per item;
+    otherwise ``fn`` gets the whole list at once.
+    """
+    def one_pass():
+        if per_call:
+            for item in items:
+                fn(item)
+        else:
+            fn(items)
+
+    one_pass()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        one_pass()
+        samples.append((time.perf_counter() - start) / len(items) * 1e6)
+    return {
+        "unit": "us/item",
+        "median": round(statistics.median(samples), 3),
+        "min": round(min(samples), 3),
+        "items": len(items),
+        "repeat": repeat,
+    }
+
+
+def run_suite(limit: int, model_limit: int, repeat: int, only: list = None) -> dict:
+    headlines, biased = load_inputs(limit, model_limit)
+    results = {}
+
+    def wanted(name: str) -> bool:
+        return not only or name in only
+
+    if wanted("filter_classify"):
+        pf = PoliticalFilter()
+        results["filter_classify"] = bench(pf.classify, headlines, repeat)
+    if wanted("filter_match"):
+        pf = PoliticalFilter()
+        results["filter_match"] = bench(pf.match, headlines, repeat)
+    if wanted("filter_classify_many"):
+        pf = PoliticalFilter()
+        results["filter_classify_many"] = bench(pf.classify_many, pd.Series(headlines), repeat, per_call=False)
+    if wanted("clean_text"):
+        results["clean_text"] = bench(DataPreprocessor.clean_text, headlines, repeat)
+    if wanted("clean_series"):
+        results["clean_series"] = bench(DataPreprocessor.clean_series, pd.Series(headlines), repeat, per_call=False)
+
+    if wanted("predict_baseline"):
+        if BASELINE_MODEL.exists():
+            from src.inference.predictor import BiasPredictor
+            predictor = BiasPredictor("baseline")
+            results["predict_baseline"] = bench(predictor._predict_baseline, biased, repeat)
+        else:
+            print(f"⚠️ {BASELINE_MODEL} not found – skipping predict_baseline")
+
+    nli_benches = ("predict_nli", "predict_nli_batch", "predict_end_to_end")
+    if any(wanted(name) for name in nli_benches):
+        predictor = tiny_nli_predictor()
+        if wanted("predict_nli"):
+            results["predict_nli"] = bench(predictor._predict_nli, biased, repeat)
+        if wanted("predict_nli_batch"):
+            results["predict_nli_batch"] = bench(predictor._predict_nli_batch, biased, repeat, per_call=False)
+        if wanted("predict_end_to_end"):
+            results["predict_end_to_end"] = bench(predictor.predict, headlines[:model_limit * 4], repeat)
+
+    return {"meta": environment(), "benchmarks": results}
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+    if "torch" in sys.modules:
+        meta["torch"] = sys.modules["torch"].__version__
+    return meta
+
+
+# ── Comparison ───────────────────────────────────────────────
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list:
+    """Print a comparison table; return the names of regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':<22s} {'baseline':>12s} {'current':>12s} {'change':>9s}")
+    for name, base in baseline["benchmarks"].items():
+        cur = current["benchmarks"].get(name)
+        if cur is None:
+            print(f"{name:<22s} {base['median']:>12.3f} {'missing':>12s}")
+            continue
+        change = cur["median"] / base["median"] - 1 if base["median"] else 0.0
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  ← REGRESSION"
+        elif change < -tolerance:
+            flag = "  (faster)"
+        print(f"{name:<22s} {base['median']:>12.3f} {cur['median']:>12.3f} {change:>+8.1%}{flag}")
+    for name in current["benchmarks"].keys() - baseline["benchmarks"].keys():
+        print(f"{name:<22s} {'new':>12s} {current['benchmarks'][name]['median']:>12.3f}")
+    print(f"\nTolerance ±{tolerance:.0%} on median µs/item: {len(regressions)} regression(s)")
+    return regressions
+
+
+def save_results(results: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    print(f"\nResults saved → {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run the suite and write results JSON")
+    p_run.add_argument("--out", type=Path, default=None, help="Results file (default: print only)")
+    p_run.add_argument("--limit", type=int, default=500, help="Dataset headlines for the cheap benchmarks")
+    p_run.add_argument("--model-limit", type=int, default=32, help="Model-bound headlines for the model benchmarks")
+    p_run.add_argument("--repeat", type=int, default=5, help="Timed passes per benchmark")
+    p_run.add_argument("--only", nargs="+", default=None, help="Run just these benchmarks")
+    p_run.add_argument(
+        "--compare", type=Path, nargs="?", const=DEFAULT_BASELINE, default=None,
+        help=f"Also compare against this baseline, written by this run if missing (default: {DEFAULT_BASELINE.relative_to(ROOT)})",
+    )
+    p_run.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown (default: 0.10)")
+
+    p_cmp = sub.add_parser("compare", help="Compare results against a baseline")
+    p_cmp.add_argument("baseline", type=Path)
+    p_cmp.add_argument("current", type=Path)
+    p_cmp.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown (default: 0.10)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_suite(args.limit, args.model_limit, args.repeat, args.only)
+        print(f"\n{'benchmark':<22s} {'median µs':>12s} {'min µs':>12s} {'items':>6s}")
+        for name, r in results["benchmarks"].items():
+            print(f"{name:<22s} {r['median']:>12.3f} {r['min']:>12.3f} {r['items']:>6d}")
+        if args.out:
+            save_results(results, args.out)
+        if args.compare:
+            if not args.compare.exists():
+                print(f"\n⚠️ No baseline at {args.compare} – saving this run as the baseline")
+                save_results(results, args.compare)
+                return
+            baseline = json.loads(args.compare.read_text())
+            sys.exit(1 if compare(baseline, results, args.tolerance) else 0)
+    else:
+        if not args.baseline.exists():
+            sys.exit(f"No baseline at {args.baseline} – create one with `suite.py run --compare {args.baseline}`")
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+        sys.exit(1 if compare(baseline, current, args.tolerance) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ All paths, hyperparameters, label maps, and scraper settings live here.
 Every module imports from this file instead of hardcoding values.
 """
 
+import os
 from pathlib import Path
 
 # ── Project Root ──────────────────────────────────────────────
@@ -18,10 +19,13 @@ MODELS_DIR     = ROOT_DIR / "models"
 
 RAW_CSV        = RAW_DATA_DIR / "india_news_raw.csv"
 PROCESSED_CSV  = PROCESSED_DIR / "india_clean_dataset.csv"
+PROCESSED_DATASET = PROCESSED_DIR / "india_clean_dataset.arrow"   # labels, gates, split
+PREPROCESS_MANIFEST = PROCESSED_DIR / "preprocess_manifest.sqlite"  # incremental runs
 
 BASELINE_MODEL = MODELS_DIR / "bias_model_3class.pkl"
 BASELINE_TFIDF = MODELS_DIR / "tfidf_vectorizer_3class.pkl"
 BERT_MODEL_DIR = MODELS_DIR / "indicbert_bias"
+ONNX_MODEL_DIR = MODELS_DIR / "nli_onnx"
 
 # ── Label Schema ──────────────────────────────────────────────
 LABEL_MAP = {0: "Left", 1: "Neutral", 2: "Right"}
@@ -36,7 +40,8 @@ def map_5_to_3(label: str) -> str:
     return "Right"  # Center-Right, Right
 
 # ── NLI Zero-Shot Settings (PRIMARY MODEL) ────────────────────
-NLI_MODEL_NAME = "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli"
+# Override with BIAS_NLI_MODEL (a hub name or local directory).
+NLI_MODEL_NAME = os.environ.get("BIAS_NLI_MODEL", "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli")
 
 # Each hypothesis is tested against the headline via NLI entailment.
 # Scores are aggregated per bias class for the final prediction.
@@ -59,10 +64,81 @@ NLI_HYPOTHESES = {
     ],
 }
 
+# Each hypothesis is wrapped in this template before scoring. It is the
+# zero-shot pipeline default, kept so scores match the pipeline exactly.
+NLI_HYPOTHESIS_TEMPLATE = "This example is {}."
+
 # Minimum confidence gap between top-2 classes to make a call;
 # below this threshold the headline is classified Neutral.
 NLI_CONFIDENCE_THRESHOLD = 0.08
 
+# ── Inference Settings ───────────────────────────────────
+# Headlines that reach the model are scored in padded batches of this size.
+PREDICT_BATCH_SIZE = 32
+
+# `run.py score` reads its input and writes checkpointed parts in chunks
+# of this many rows.
+SCORE_CHUNK_SIZE = 10_000
+
+# The "cascade" model accepts the TF-IDF baseline's answer when its top-2
+# probability margin is at least this; closer calls escalate to NLI.
+CASCADE_BASELINE_MARGIN = 0.25
+
+# The "onnx" backend loads the int8 export when present, else fp32.
+ONNX_USE_QUANTIZED = True
+
+# ── Prediction Cache ─────────────────────────────────────
+# In-process LRU of model results keyed on the normalized headline.
+CACHE_MAX_ENTRIES = 10_000
+CACHE_TTL_SECONDS = 24 * 60 * 60
+# Optional SQLite tier that survives restarts (None = memory only),
+# e.g. MODELS_DIR / "prediction_cache.sqlite".
+CACHE_DB_PATH = None
+
+# ── Serving Settings ─────────────────────────────────────
+# Model types loaded and warmed up when the app starts; /readyz reports
+# not-ready until they are done. Override with BIAS_PRELOAD_MODELS=nli,baseline
+# (empty string = no preload).
+APP_PRELOAD_MODELS = [
+    m.strip() for m in os.environ.get("BIAS_PRELOAD_MODELS", "nli").split(",") if m.strip()
+]
+
+# Micro-batching for /api/predict: concurrent requests are coalesced into
+# one forward pass that closes at this size or after this many ms.
+SERVE_MAX_BATCH_SIZE = int(os.environ.get("BIAS_MAX_BATCH_SIZE", "16"))
+SERVE_MAX_WAIT_MS = float(os.environ.get("BIAS_MAX_WAIT_MS", "5"))
+
+# Admission control: at most this many headlines wait in each model's
+# batcher queue; beyond it /api/predict answers 503 with Retry-After.
+# Requests with a deadline_ms that the queue cannot meet get the TF-IDF
+# baseline's answer (gate "deadline_baseline"), so it is preloaded too.
+SERVE_MAX_QUEUE = int(os.environ.get("BIAS_MAX_QUEUE", "256"))
+
+# Upper limit on headlines per /api/predict/batch request.
+SERVE_MAX_BULK_HEADLINES = int(os.environ.get("BIAS_MAX_BULK_HEADLINES", "500"))
+
+# "inline" runs models inside the app process (in worker threads);
+# "process" hands inference to SERVE_WORKERS worker processes, each with its
+# own model copy and SERVE_WORKER_THREADS torch threads (0 = cores / workers).
+SERVE_EXECUTION_MODE = os.environ.get("BIAS_EXECUTION_MODE", "inline")
+SERVE_WORKERS = int(os.environ.get("BIAS_WORKERS", "2"))
+SERVE_WORKER_THREADS = int(os.environ.get("BIAS_WORKER_THREADS", "0"))
+
+# Profiling: BIAS_PROFILE=cprofile|torch captures the next
+# BIAS_PROFILE_REQUESTS model batches in the app (or predictions in
+# `run.py predict --profile`) and writes the trace to PROFILE_DIR.
+PROFILE_MODE = os.environ.get("BIAS_PROFILE", "")
+PROFILE_REQUESTS = int(os.environ.get("BIAS_PROFILE_REQUESTS", "20"))
+PROFILE_DIR = ROOT_DIR / "profiles"
+
+# Synthetic headlines that pass both gates, used to warm up the model path.
+WARMUP_HEADLINES = [
+    "Opposition slams government over rising unemployment",
+    "Prime Minister praises budget as historic for the nation",
+    "Congress demands accountability over electoral bonds",
+    "BJP hails Article 370 abrogation as victory for national unity",
+]
+
 # ── BERT Settings (LEGACY) ───────────────────────────────────
 BERT_MODEL_NAME   = "bert-base-multilingual-cased"
 BERT_MAX_LENGTH   = 64
@@ -74,10 +150,28 @@ BERT_LEARNING_RATE = 2e-5
 TFIDF_MAX_FEATURES = 8000
 TFIDF_NGRAM_RANGE  = (1, 3)
 
+# ── Preprocessing Settings ───────────────────────────────────
+# `run.py preprocess` streams the raw CSV in chunks of this many rows;
+# smaller chunks bound memory further on large scrape dumps.
+PREPROCESS_CHUNK_SIZE = int(os.environ.get("BIAS_PREPROCESS_CHUNK_SIZE", "100000"))
+
+# The scraper and preprocessor drop near-duplicate headlines: those whose
+# cleaned word sets have an estimated Jaccard similarity of at least this
+# with an earlier headline (MinHash with DEDUP_NUM_PERM hashes + LSH).
+# BIAS_DEDUP_THRESHOLD=1 keeps only exact-duplicate removal.
+DEDUP_JACCARD_THRESHOLD = float(os.environ.get("BIAS_DEDUP_THRESHOLD", "0.7"))
+DEDUP_NUM_PERM = 64
+
+# Share of the processed dataset in the persisted "test" split, shared by
+# the trainers and the evaluator.
+DATASET_TEST_SIZE = 0.2
+
 # ── Scraper Settings ─────────────────────────────────────────
 SCRAPE_TARGET_TOTAL    = 1500
 SCRAPE_MAX_PAGES       = 30
-SCRAPE_DELAY_RANGE     = (0.6, 1.5)
+SCRAPE_DELAY_RANGE     = (0.6, 1.5)     # seconds between request starts, per site
+SCRAPE_CONCURRENCY     = int(os.environ.get("BIAS_SCRAPE_CONCURRENCY", "16"))   # in flight, all sites
+SCRAPE_TIMEOUT         = 10
 SCRAPE_USER_AGENT      = (
     "Mozilla/5.0 (compatible; BiasBot/1.0; +https://github.com/Adityahatake/bias-spectra)"
 )
@@ -4,10 +4,16 @@ BiasSpectra CLI – Command-line entry point.
 Usage:
     python run.py predict "Opposition criticizes govt on farm laws"
     python run.py predict --model baseline "headline text"
+    python run.py predict --timings --profile cprofile --profile-requests 50 "headline text"
+    python run.py preprocess
     python run.py train --model baseline
     python run.py train --model bert
     python run.py evaluate
+    python run.py export --quantize
     python run.py app
+    python run.py serve --workers 4
+    python run.py score --input headlines.csv --output scored.parquet --workers 4
+    python run.py loadtest --url http://127.0.0.1:8000 --qps 50 --count 2000
 """
 
 import argparse
@@ -21,10 +27,25 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def cmd_predict(args):
     """Run a single prediction."""
+    from config import PROFILE_MODE, PROFILE_REQUESTS
+    from src.inference.cache import PredictionCache
     from src.inference.predictor import BiasPredictor
 
-    predictor = BiasPredictor(model_type=args.model)
-    result = predictor.predict(args.headline)
+    profile = args.profile or PROFILE_MODE
+    if profile:
+        from src.profiling import RequestProfiler
+
+        # Cache off so every repetition does the full work being profiled
+        predictor = BiasPredictor(model_type=args.model, cache=PredictionCache(max_entries=0))
+        predictor.predict(args.headline)  # load the model outside the capture
+        requests = args.profile_requests or PROFILE_REQUESTS
+        profiler = RequestProfiler(profile, requests=requests, name=f"predict-{args.model}")
+        predict = profiler.wrap(predictor.predict)
+        for _ in range(requests):
+            result = predict(args.headline, timings=args.timings)
+    else:
+        predictor = BiasPredictor(model_type=args.model)
+        result = predictor.predict(args.headline, timings=args.timings)
 
     print(f"\n{'─' * 50}")
     print(f"  Headline : {args.headline}")
@@ -36,9 +57,28 @@ def cmd_predict(args):
         for label, conf in result.confidence.items():
             bar = "█" * int(conf * 30) + "░" * (30 - int(conf * 30))
             print(f"    {label:>7s}  {bar}  {conf:.1%}")
+    if result.timings:
+        print("  Timings  :")
+        for stage, value in result.timings.items():
+            unit = "" if stage == "batch_size" else " ms"
+            print(f"    {stage:<22s} {value}{unit}")
+    if profile:
+        print(f"  Profile  : {profiler.path}")
     print(f"{'─' * 50}\n")
 
 
+def cmd_preprocess(args):
+    """Clean, dedup and balance the raw scrape into the processed dataset."""
+    from src.data.preprocessor import DataPreprocessor
+
+    df = DataPreprocessor(
+        raw_csv=args.input, out_csv=args.output, dataset_path=args.dataset,
+        target_total=args.target_total, chunk_size=args.chunk_size,
+        manifest_path=args.manifest if args.incremental else None,
+    ).run()
+    print(f"✅ {len(df)} rows {df['bias'].value_counts().to_dict()} → {args.output}, {args.dataset}")
+
+
 def cmd_train(args):
     """Run model training."""
     if args.model == "baseline":
@@ -72,6 +112,28 @@ def cmd_evaluate(args):
         except FileNotFoundError:
             print("⚠️ BERT model not found – skipping.")
 
+    if args.model == "cascade":
+        try:
+            evaluator.evaluate_cascade()
+        except FileNotFoundError:
+            print("⚠️ Baseline model not found – train it first.")
+
+
+def cmd_export(args):
+    """Export the NLI model to ONNX for the CPU backend."""
+    from src.inference.onnx_backend import export_onnx
+
+    path = export_onnx(out_dir=args.out_dir, quantize=args.quantize)
+    print(f"✅ ONNX model written to {path}")
+
+    if args.check:
+        from src.evaluation.evaluator import ModelEvaluator
+        report = ModelEvaluator().evaluate_onnx_agreement(limit=args.check)
+        print(
+            f"   Label agreement with PyTorch: {report['accuracy']:.1%} overall, "
+            f"{report['model_routed_agreement']:.1%} of {report['model_routed']} model-routed headlines"
+        )
+
 
 def cmd_app(args):
     """Launch the FastAPI server."""
@@ -79,6 +141,43 @@ def cmd_app(args):
     subprocess.run([sys.executable, "-m", "uvicorn", "src.app:app", "--reload", "--host", "127.0.0.1", "--port", "8000"])
 
 
+def cmd_score(args):
+    """Score a CSV/JSONL/Parquet file of headlines, resumably."""
+    from src.inference.scoring import BulkScorer
+
+    summary = BulkScorer(
+        args.input, args.output,
+        model_type=args.model, workers=args.workers,
+        chunk_size=args.chunk_size, column=args.column,
+    ).run()
+    print(
+        f"✅ {summary['rows']} rows scored in {summary['seconds']}s "
+        f"({summary['skipped_chunks']}/{summary['chunks']} chunks resumed) → {args.output}"
+    )
+
+
+def cmd_loadtest(args):
+    """Replay PredictRequest payloads against the API and report latency."""
+    import json
+    from src.evaluation.loadtest import LoadTester, load_payloads
+
+    payloads = load_payloads(args.requests, model=args.model)
+    tester = LoadTester(payloads, url=args.url, concurrency=args.concurrency, qps=args.qps)
+    report = tester.run(count=args.count)
+    LoadTester.print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved → {args.json}")
+
+
+def cmd_serve(args):
+    """Serve the API with forked workers that share one copy of the model weights."""
+    from src.serving.prefork import PreforkServer
+
+    PreforkServer(host=args.host, port=args.port, workers=args.workers).run()
+
+
 def main():
     parser = argparse.ArgumentParser(
         prog="biasspectra",
@@ -90,11 +189,49 @@ def main():
     p_predict = subparsers.add_parser("predict", help="Predict bias for a headline")
     p_predict.add_argument("headline", type=str, help="News headline to analyze")
     p_predict.add_argument(
-        "--model", choices=["nli", "bert", "baseline"], default="nli",
+        "--model", choices=["nli", "onnx", "cascade", "bert", "baseline"], default="nli",
         help="Model to use (default: nli)",
     )
+    p_predict.add_argument("--timings", action="store_true", help="Print the per-stage timing breakdown")
+    p_predict.add_argument(
+        "--profile", choices=["cprofile", "torch"], default=None,
+        help="Profile repeated predictions and write a trace (default: $BIAS_PROFILE)",
+    )
+    p_predict.add_argument(
+        "--profile-requests", type=int, default=None,
+        help="Predictions to profile (default: $BIAS_PROFILE_REQUESTS or 20)",
+    )
     p_predict.set_defaults(func=cmd_predict)
 
+    # preprocess
+    from config import (
+        PREPROCESS_CHUNK_SIZE, PREPROCESS_MANIFEST, PROCESSED_CSV, PROCESSED_DATASET, RAW_CSV, SCRAPE_TARGET_TOTAL,
+    )
+    p_prep = subparsers.add_parser("preprocess", help="Clean and balance the raw scrape (streamed)")
+    p_prep.add_argument("--input", default=str(RAW_CSV), help=f"Raw CSV (default: {RAW_CSV})")
+    p_prep.add_argument("--output", default=str(PROCESSED_CSV), help=f"Output CSV (default: {PROCESSED_CSV})")
+    p_prep.add_argument(
+        "--dataset", default=str(PROCESSED_DATASET),
+        help=f"Arrow dataset for training/evaluation (default: {PROCESSED_DATASET})",
+    )
+    p_prep.add_argument(
+        "--target-total", type=int, default=SCRAPE_TARGET_TOTAL,
+        help=f"Balanced dataset size (default: {SCRAPE_TARGET_TOTAL})",
+    )
+    p_prep.add_argument(
+        "--chunk-size", type=int, default=PREPROCESS_CHUNK_SIZE,
+        help=f"Raw rows held in memory at once (default: {PREPROCESS_CHUNK_SIZE})",
+    )
+    p_prep.add_argument(
+        "--incremental", action="store_true",
+        help="Only process raw rows not seen by earlier incremental runs, merging into their sample",
+    )
+    p_prep.add_argument(
+        "--manifest", default=str(PREPROCESS_MANIFEST),
+        help=f"State kept between incremental runs (default: {PREPROCESS_MANIFEST})",
+    )
+    p_prep.set_defaults(func=cmd_preprocess)
+
     # train
     p_train = subparsers.add_parser("train", help="Train a model")
     p_train.add_argument(
@@ -106,15 +243,73 @@ def main():
     # evaluate
     p_eval = subparsers.add_parser("evaluate", help="Evaluate model performance")
     p_eval.add_argument(
-        "--model", choices=["all", "baseline", "bert"], default="all",
-        help="Which legacy model to evaluate (default: all)",
+        "--model", choices=["all", "baseline", "bert", "cascade"], default="all",
+        help="Which legacy model to evaluate, or sweep cascade margins (default: all)",
     )
     p_eval.set_defaults(func=cmd_evaluate)
 
+    # export
+    from config import ONNX_MODEL_DIR
+    p_export = subparsers.add_parser("export", help="Export the NLI model to ONNX")
+    p_export.add_argument(
+        "--quantize", action="store_true",
+        help="Also write a dynamically int8-quantized model",
+    )
+    p_export.add_argument(
+        "--out-dir", default=str(ONNX_MODEL_DIR),
+        help=f"Output directory (default: {ONNX_MODEL_DIR})",
+    )
+    p_export.add_argument(
+        "--check", type=int, default=0, metavar="N",
+        help="Compare labels with PyTorch on the first N dataset headlines (0 = skip)",
+    )
+    p_export.set_defaults(func=cmd_export)
+
     # app
     p_app = subparsers.add_parser("app", help="Launch Streamlit web app")
     p_app.set_defaults(func=cmd_app)
 
+    # score
+    from config import SCORE_CHUNK_SIZE
+    p_score = subparsers.add_parser("score", help="Score a file of headlines (CSV/JSONL/Parquet)")
+    p_score.add_argument("--input", required=True, help="Input .csv, .jsonl or .parquet file")
+    p_score.add_argument("--output", required=True, help="Output .csv, .jsonl or .parquet path")
+    p_score.add_argument(
+        "--model", choices=["nli", "onnx", "cascade", "bert", "baseline"], default="nli",
+        help="Model to use (default: nli)",
+    )
+    p_score.add_argument("--workers", type=int, default=1, help="Scoring processes (default: 1)")
+    p_score.add_argument(
+        "--chunk-size", type=int, default=SCORE_CHUNK_SIZE,
+        help=f"Rows per chunk and checkpoint (default: {SCORE_CHUNK_SIZE})",
+    )
+    p_score.add_argument("--column", default="headline", help="Headline column (default: headline)")
+    p_score.set_defaults(func=cmd_score)
+
+    # loadtest
+    p_load = subparsers.add_parser("loadtest", help="Replay requests against the API and report latency")
+    p_load.add_argument(
+        "--requests", default=None, metavar="JSONL",
+        help="JSONL of PredictRequest payloads (default: headlines from the processed dataset)",
+    )
+    p_load.add_argument("--url", default=None, help="Running server, e.g. http://127.0.0.1:8000 (default: in-process app)")
+    target = p_load.add_mutually_exclusive_group()
+    target.add_argument("--concurrency", type=int, default=8, help="Closed-loop clients (default: 8)")
+    target.add_argument("--qps", type=float, default=None, help="Open-loop request rate instead of --concurrency")
+    p_load.add_argument("--count", type=int, default=None, help="Requests to send (default: one per payload)")
+    p_load.add_argument("--model", default=None, help="Override the model field of every payload")
+    p_load.add_argument("--json", default=None, help="Also write the report to this file")
+    p_load.set_defaults(func=cmd_loadtest)
+
+    # serve
+    p_serve = subparsers.add_parser(
+        "serve", help="Serve the API with N workers sharing preloaded weights",
+    )
+    p_serve.add_argument("--workers", type=int, default=2, help="Worker processes (default: 2)")
+    p_serve.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    p_serve.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    p_serve.set_defaults(func=cmd_serve)
+
     args = parser.parse_args()
     if not args.command:
         parser.print_help()
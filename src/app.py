@@ -5,26 +5,133 @@ Backend for the premium dark-themed UI for political bias detection in Indian ne
 Uses the BiasPredictor engine for inference.
 """
 
+import asyncio
+import json
+import logging
+import math
 import sys
 import os
-from contextlib import asynccontextmanager
+import threading
+import time
+from contextlib import asynccontextmanager, nullcontext, suppress
+from functools import partial
+from typing import Literal, get_args
 from pydantic import BaseModel
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 
 # Ensure project root is importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from config import (
+    APP_PRELOAD_MODELS,
+    PROFILE_MODE,
+    SERVE_EXECUTION_MODE,
+    SERVE_MAX_BATCH_SIZE,
+    SERVE_MAX_BULK_HEADLINES,
+    SERVE_MAX_QUEUE,
+    SERVE_MAX_WAIT_MS,
+    SERVE_WORKER_THREADS,
+    SERVE_WORKERS,
+)
+from src import metrics
 from src.inference.predictor import BiasPredictor, BiasResult
+from src.serving.batcher import MicroBatcher, QueueFullError
+
+logger = logging.getLogger(__name__)
 
 # ─── Caching Predictors ───────────────────────────────────────
+# Request models validate against this, so an unknown model is a 422
+# before any predictor, batcher or metric label exists for it
+ModelType = Literal["nli", "onnx", "cascade", "bert", "baseline"]
+MODEL_TYPES = get_args(ModelType)
+
 predictors = {}
+batchers = {}
+profilers = {}  # model type → RequestProfiler, when BIAS_PROFILE is set
+_predictors_lock = threading.Lock()  # get_predictor runs on the loop and in preload threads
+
+# Readiness state reported by /readyz
+readiness = {"ready": False, "models": {}, "error": None}
+
+# ─── Metrics ──────────────────────────────────────────────────
+REQUEST_SECONDS = metrics.Histogram(
+    "bias_request_seconds",
+    "End-to-end latency of prediction requests.",
+    ("route", "model"),
+)
+SHED_TOTAL = metrics.Counter(
+    "bias_shed_total",
+    "Model-bound headlines rejected (queue_full) or downgraded to the baseline (deadline).",
+    ("model", "reason"),
+)
+
+
+def _cache_lookups() -> dict:
+    counts = {}
+    for name, predictor in list(predictors.items()):
+        s = predictor.cache.stats()
+        counts[(name, "memory")] = s["hits"]
+        counts[(name, "disk")] = s["disk_hits"]
+        counts[(name, "miss")] = s["misses"]
+    return counts
+
+
+metrics.CallbackCounter(
+    "bias_cache_lookups_total",
+    "Prediction cache lookups by result (memory hit, disk hit, miss).",
+    ("model", "result"),
+    callback=_cache_lookups,
+)
+metrics.Gauge(
+    "bias_queue_depth",
+    "Headlines waiting in each model's micro-batcher queue.",
+    ("model",),
+    callback=lambda: {(name,): b.queue_depth for name, b in list(batchers.items())},
+)
+
+
+async def preload_models(model_types: list) -> None:
+    """Load and warm up each model type off the event loop, then mark ready."""
+    try:
+        for model_type in model_types:
+            start = time.perf_counter()
+            predictor = await asyncio.to_thread(get_predictor, model_type)
+            await asyncio.to_thread(predictor.warmup)
+            if model_type != "baseline":
+                await asyncio.to_thread(load_fallback, predictor)
+            readiness["models"][model_type] = round(time.perf_counter() - start, 2)
+            logger.info("Preloaded %s model in %.1fs", model_type, readiness["models"][model_type])
+        readiness["ready"] = True
+    except Exception as e:
+        logger.exception("Model preload failed")
+        readiness["error"] = str(e)
+
+
+def load_fallback(predictor: BiasPredictor) -> None:
+    """Load the baseline used for deadline fallbacks, if it has been trained."""
+    try:
+        predictor._load_backend("baseline")
+    except FileNotFoundError:
+        logger.warning("Baseline model not found – deadline fallback disabled for %s", predictor.model_type)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Preload the default NLI predictor on startup to save time later
+    # Preload and warm up the configured predictors in the background so
+    # /healthz answers immediately while /readyz waits for warmup.
+    preload = asyncio.create_task(preload_models(APP_PRELOAD_MODELS))
     yield
+    preload.cancel()
+    with suppress(asyncio.CancelledError):
+        await preload   # let a load in progress finish before tearing down
+    for batcher in batchers.values():
+        await batcher.close()
+    batchers.clear()
+    for predictor in predictors.values():
+        if hasattr(predictor, "close"):
+            predictor.close()
     predictors.clear()
 
 
@@ -35,13 +142,50 @@ app = FastAPI(
 )
 
 def get_predictor(model_type: str) -> BiasPredictor:
-    if model_type not in predictors:
-         predictors[model_type] = BiasPredictor(model_type=model_type)
-    return predictors[model_type]
+    predictor = predictors.get(model_type)
+    if predictor is not None:
+        return predictor
+    # Model types label metrics, so only the fixed set may get state
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Unknown model type: {model_type!r} (expected one of {MODEL_TYPES})")
+    with _predictors_lock:
+        if model_type not in predictors:
+            if SERVE_EXECUTION_MODE == "process":
+                from src.serving.workers import PooledPredictor
+                predictors[model_type] = PooledPredictor(
+                    model_type, num_workers=SERVE_WORKERS, threads_per_worker=SERVE_WORKER_THREADS,
+                )
+            else:
+                predictors[model_type] = BiasPredictor(model_type=model_type)
+        return predictors[model_type]
+
+def get_batcher(model_type: str) -> MicroBatcher:
+    if model_type not in batchers:
+        predictor = get_predictor(model_type)
+        # Routes gate before submitting; timings are cheap and only returned on debug
+        predict = partial(predictor.predict_gated_batch, timings=True)
+        # In process mode the model runs in the workers, which profile themselves
+        if PROFILE_MODE and SERVE_EXECUTION_MODE != "process":
+            from src.profiling import RequestProfiler
+            profilers[model_type] = RequestProfiler(PROFILE_MODE, name=f"{model_type}-batches")
+            predict = profilers[model_type].wrap(predict)
+        batchers[model_type] = MicroBatcher(
+            predict,
+            max_batch_size=SERVE_MAX_BATCH_SIZE,
+            max_wait_ms=SERVE_MAX_WAIT_MS,
+            name=model_type,
+            max_concurrency=getattr(predictor, "num_workers", 1),
+            max_queue=SERVE_MAX_QUEUE,
+            # Same key as the cache, so syndicated copies coalesce too
+            key=lambda headline: predictor.cache.key(headline, model_type),
+        )
+    return batchers[model_type]
 
 class PredictRequest(BaseModel):
     headline: str
-    model: str = "nli"
+    model: ModelType = "nli"
+    deadline_ms: float | None = None  # answer with the baseline rather than miss this
+    debug: bool = False               # include the per-stage timing breakdown
 
 class PredictResponse(BaseModel):
     label: str
@@ -49,6 +193,44 @@ class PredictResponse(BaseModel):
     gate: str
     reasoning: str
     is_model_prediction: bool
+    timings: dict | None = None  # "<model>.<stage>" → ms, batch_size, total (debug only)
+
+    @classmethod
+    def from_result(cls, result: BiasResult, **extra) -> "PredictResponse":
+        return cls(
+            label=result.label,
+            confidence=result.confidence,
+            gate=result.gate,
+            reasoning=result.reasoning,
+            is_model_prediction=result.is_model_prediction,
+            **extra,
+        )
+
+class BatchPredictRequest(BaseModel):
+    headlines: list[str]
+    model: ModelType = "nli"
+    debug: bool = False
+
+def debug_timings(route_seconds: dict, result: BiasResult) -> dict:
+    """Stage times measured in the route plus those the model batch reported."""
+    timings = {stage: round(s * 1000, 3) for stage, s in route_seconds.items()}
+    timings.update(result.timings or {"batch_size": 0})
+    return timings
+
+class BatchPredictResponse(PredictResponse):
+    index: int      # position in the request's headlines list
+    headline: str
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: preloaded models are loaded and warmed up."""
+    status_code = 200 if readiness["ready"] else 503
+    return JSONResponse(status_code=status_code, content=readiness)
 
 @app.post("/api/predict", response_model=PredictResponse)
 async def predict(req: PredictRequest):
@@ -56,19 +238,143 @@ async def predict(req: PredictRequest):
         raise HTTPException(status_code=400, detail="Headline cannot be empty.")
         
     try:
-        predictor = get_predictor(req.model)
-        result: BiasResult = predictor.predict(req.headline)
+        # Gates are cheap and answered inline; model-bound headlines are
+        # coalesced with concurrent requests into one batched forward pass.
+        started = time.perf_counter()
+        with REQUEST_SECONDS.time(route="/api/predict", model=req.model), \
+                (metrics.collect_timings() if req.debug else nullcontext({})) as seconds:
+            predictor = get_predictor(req.model)
+            result: BiasResult = predictor.gate(req.headline)
+            if result is None:
+                result = await predict_model(predictor, req)
         
-        return PredictResponse(
-            label=result.label,
-            confidence=result.confidence,
-            gate=result.gate,
-            reasoning=result.reasoning,
-            is_model_prediction=result.is_model_prediction
+        if not req.debug:
+            return PredictResponse.from_result(result)
+        timings = debug_timings(seconds, result)
+        timings["total"] = round((time.perf_counter() - started) * 1000, 3)
+        return PredictResponse.from_result(result, timings=timings)
+    except QueueFullError as e:
+        SHED_TOTAL.inc(model=req.model, reason="queue_full")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))},
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def predict_model(predictor: BiasPredictor, req: PredictRequest) -> BiasResult:
+    """
+    Queue a model-bound headline. With a deadline, answer from the
+    baseline instead when the estimated queue wait – or the actual
+    wait – would exceed it.
+    """
+    batcher = get_batcher(req.model)
+    if req.deadline_ms is None or req.model == "baseline":
+        return await batcher.submit(req.headline)
+
+    budget = req.deadline_ms / 1000
+    if batcher.estimated_wait() <= budget:
+        try:
+            return await asyncio.wait_for(batcher.submit(req.headline), budget)
+        except asyncio.TimeoutError:
+            pass
+
+    try:
+        result = await asyncio.to_thread(predictor.predict_fallback, req.headline)
+    except FileNotFoundError:
+        # No trained baseline: a late answer beats none
+        return await batcher.submit(req.headline)
+    SHED_TOTAL.inc(model=req.model, reason="deadline")
+    return result
+
+@app.post("/api/predict/batch")
+async def predict_batch(req: BatchPredictRequest):
+    """
+    Score many headlines, streaming one NDJSON BatchPredictResponse per
+    headline as it finishes. Gated headlines are emitted immediately;
+    model-bound ones follow as their micro-batches complete.
+    """
+    if not req.headlines:
+        raise HTTPException(status_code=400, detail="Headlines cannot be empty.")
+    if len(req.headlines) > SERVE_MAX_BULK_HEADLINES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {SERVE_MAX_BULK_HEADLINES} headlines per request.",
+        )
+    blank = [i for i, h in enumerate(req.headlines) if not h.strip()]
+    if blank:
+        raise HTTPException(status_code=400, detail=f"Empty headlines at indices {blank}.")
+
+    predictor = get_predictor(req.model)
+    # One vectorised filter pass over the request, off the event loop
+    gated, per_headline = await asyncio.to_thread(predictor.gate_many, req.headlines)
+    filter_seconds = {f"{req.model}.filter": per_headline}
+
+    # Admit and queue the whole request or none of it
+    batcher = get_batcher(req.model)
+    model_bound = [i for i, result in enumerate(gated) if result is None]
+    try:
+        pending = batcher.submit_many([req.headlines[i] for i in model_bound])
+    except QueueFullError as e:
+        SHED_TOTAL.inc(len(model_bound), model=req.model, reason="queue_full")
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+
+    async def run_model(index: int, waiter):
+        try:
+            return index, await waiter, None
+        except Exception as e:
+            return index, None, str(e)
+
+    # Started now, so the queued results are awaited even if streaming never begins
+    tasks = [asyncio.create_task(run_model(i, waiter)) for i, waiter in zip(model_bound, pending)]
+
+    async def stream():
+        started = time.perf_counter()
+        try:
+            for index, (headline, result) in enumerate(zip(req.headlines, gated)):
+                if result is not None:
+                    line = BatchPredictResponse.from_result(
+                        result, index=index, headline=headline,
+                        timings=debug_timings(filter_seconds, result) if req.debug else None,
+                    )
+                    yield line.model_dump_json() + "\n"
+
+            for done in asyncio.as_completed(tasks):
+                index, result, error = await done
+                if error is not None:
+                    yield json.dumps({"index": index, "headline": req.headlines[index], "error": error}) + "\n"
+                    continue
+                line = BatchPredictResponse.from_result(
+                    result, index=index, headline=req.headlines[index],
+                    timings=debug_timings(filter_seconds, result) if req.debug else None,
+                )
+                yield line.model_dump_json() + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started, route="/api/predict/batch", model=req.model
+            )
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint: gates, stage latencies, load times, cache and queues."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/stats")
+async def stats():
+    """Micro-batching, cache and worker-pool statistics per model type."""
+    return {
+        "batching": {name: b.stats() for name, b in batchers.items()},
+        "cache": {name: p.cache.stats() for name, p in predictors.items()},
+        "workers": {
+            name: p.pool.stats() for name, p in predictors.items() if getattr(p, "pool", None)
+        },
+    }
+
 # Configure static file serving for the frontend
 frontend_dir = os.path.join(os.path.dirname(__file__), "frontend")
 os.makedirs(frontend_dir, exist_ok=True)
@@ -0,0 +1,290 @@
+"""
+AsyncCrawler – Concurrent, per-domain rate-limited headline crawler.
+====================================================================
+Crawls every source at once on one asyncio event loop and one pooled
+``httpx.AsyncClient``:
+
+  concurrency – a global semaphore caps requests in flight across all
+                sites (``SCRAPE_CONCURRENCY``)
+  politeness  – each source has a ``TokenBucket``: one token per
+                request, refilled after a random ``SCRAPE_DELAY_RANGE``
+                interval, so a site sees at most one request start per
+                delay while the other sites are fetched in parallel
+
+Waiting for a site's token does not hold a global slot, so a slow or
+strict site never starves the others. Article pages go through the same
+limiter as section pages; their headline is read from ``og:title``,
+``<title>`` or ``<h1>``.
+
+Sources only need a ``base`` URL, so the crawler runs unchanged against
+a local stand-in server (``{"base": "http://127.0.0.1:8081", ...}``) or
+an ``httpx`` transport passed as ``transport``.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import (
+    SCRAPE_CONCURRENCY,
+    SCRAPE_DELAY_RANGE,
+    SCRAPE_MAX_PAGES,
+    SCRAPE_SOURCES,
+    SCRAPE_TIMEOUT,
+    SCRAPE_USER_AGENT,
+)
+
+logger = logging.getLogger(__name__)
+
+SKIP_LINK_PARTS = ("/video", "/gallery", "/photos", "/tag/", "/author/")
+
+
+class TokenBucket:
+    """
+    Async token bucket whose refill interval is drawn from a range.
+
+    Usage:
+        bucket = TokenBucket((0.6, 1.5))   # capacity 1: never bursts
+        await bucket.acquire()             # before each request to the site
+    """
+
+    def __init__(self, delay_range: tuple = SCRAPE_DELAY_RANGE, capacity: int = 1) -> None:
+        self.delay_range = delay_range
+        self.capacity = capacity
+        self._tokens = capacity
+        self._refill_at: Optional[float] = None   # when the next token arrives
+        self._lock = asyncio.Lock()               # FIFO: waiters are served in order
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if self._refill_at is None:
+                        self._refill_at = now + random.uniform(*self.delay_range)
+                    return
+                await asyncio.sleep(self._refill_at - now)
+
+    def _refill(self, now: float) -> None:
+        while self._refill_at is not None and self._refill_at <= now:
+            self._tokens += 1
+            if self._tokens >= self.capacity:
+                self._refill_at = None
+            else:
+                self._refill_at += random.uniform(*self.delay_range)
+
+
+class AsyncCrawler:
+    """
+    Crawl configured news sources concurrently and collect headlines.
+
+    Usage:
+        crawler = AsyncCrawler(concurrency=16)
+        rows = crawler.run(per_site=110)      # [{"headline", "url", "source", "category"}, ...]
+        more = crawler.run_homepages(exclude={h.lower() for h in ...}, needed=200)
+        crawler.stats                         # {"requests": ..., "errors": ..., "seconds": ...}
+    """
+
+    def __init__(
+        self,
+        sources: dict | None = None,
+        max_pages: int = SCRAPE_MAX_PAGES,
+        delay: tuple = SCRAPE_DELAY_RANGE,
+        concurrency: int = SCRAPE_CONCURRENCY,
+        timeout: float = SCRAPE_TIMEOUT,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.sources = sources or SCRAPE_SOURCES
+        self.max_pages = max_pages
+        self.delay = delay
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.transport = transport
+        self.stats: dict = {}
+
+    # ── Public API ───────────────────────────────────────────
+
+    def run(self, per_site: int) -> list:
+        """Crawl every source for up to ``per_site`` headlines each."""
+        return asyncio.run(self.crawl(per_site))
+
+    def run_homepages(self, exclude: set, needed: int) -> list:
+        """Up to ``needed`` new headlines linked from the source homepages."""
+        return asyncio.run(self.crawl_homepages(exclude, needed))
+
+    async def crawl(self, per_site: int) -> list:
+        async with self._client() as client:
+            per_source = await asyncio.gather(*(
+                self._crawl_site(client, domain, info, per_site)
+                for domain, info in self.sources.items()
+            ))
+        rows = []
+        for (domain, info), titles in zip(self.sources.items(), per_source):
+            logger.info("  → %d headlines from %s", len(titles), domain)
+            rows.extend(_row(title, url, domain, info) for title, url in titles)
+        self._log_stats()
+        return rows
+
+    async def crawl_homepages(self, exclude: set, needed: int) -> list:
+        rows: list = []
+        seen = set(exclude)
+
+        async def site(client, domain, info):
+            html = await self._fetch(client, info["base"], domain)
+            if not html:
+                return
+            links = list(await asyncio.to_thread(gather_links, info["base"], html))[:300]
+            for start in range(0, len(links), self.concurrency):
+                if len(rows) >= needed:
+                    return
+                window = links[start:start + self.concurrency]
+                titles = await asyncio.gather(*(self._article_headline(client, link, domain) for link in window))
+                for title, link in zip(titles, window):
+                    if title and title.lower().strip() not in seen and len(rows) < needed:
+                        seen.add(title.lower().strip())
+                        rows.append(_row(title, link, domain, info))
+
+        async with self._client() as client:
+            await asyncio.gather(*(site(client, d, i) for d, i in self.sources.items()))
+        self._log_stats()
+        return rows
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _client(self) -> httpx.AsyncClient:
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._buckets = {domain: TokenBucket(self.delay) for domain in self.sources}
+        self._counts = Counter()
+        self._started = time.perf_counter()
+        return httpx.AsyncClient(
+            headers={"User-Agent": SCRAPE_USER_AGENT},
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency),
+            transport=self.transport,
+        )
+
+    async def _crawl_site(self, client: httpx.AsyncClient, domain: str, info: dict, limit: int) -> list:
+        base = info["base"]
+        seen_urls: set = set()
+        results: list = []
+        queue = [urljoin(base, s) for s in info.get("sections", ["/"])]
+        pages = 0
+
+        try:
+            while queue and len(results) < limit and pages < self.max_pages:
+                page_url = queue.pop(0)
+                if page_url in seen_urls:
+                    continue
+                seen_urls.add(page_url)
+                pages += 1
+
+                html = await self._fetch(client, page_url, domain)
+                if not html:
+                    continue
+
+                # Extract headline from page itself (parsing off the event loop)
+                headline = await asyncio.to_thread(headline_from_html, html)
+                if headline:
+                    results.append((headline, page_url))
+
+                # Article headlines, a window of (at most) the remaining quota at a time
+                links = await asyncio.to_thread(gather_links, base, html)
+                articles = [
+                    link for link in list(links - seen_urls)[:150]
+                    if not any(part in link for part in SKIP_LINK_PARTS)
+                ]
+                while articles and len(results) < limit:
+                    window, articles = articles[:limit - len(results)], articles[limit - len(results):]
+                    titles = await asyncio.gather(*(self._article_headline(client, link, domain) for link in window))
+                    results.extend((title, link) for title, link in zip(titles, window) if title)
+
+                # Expand queue
+                for link in links:
+                    if link not in seen_urls and len(queue) < 500:
+                        queue.append(link)
+        except Exception as exc:
+            logger.error("Error crawling %s: %s", domain, exc)
+
+        # Deduplicate titles within site
+        seen_titles: set = set()
+        cleaned = []
+        for t, u in results[:limit]:
+            key = t.strip().lower()
+            if key not in seen_titles:
+                seen_titles.add(key)
+                cleaned.append((t, u))
+        return cleaned
+
+    async def _article_headline(self, client: httpx.AsyncClient, url: str, domain: str) -> str | None:
+        html = await self._fetch(client, url, domain)
+        return await asyncio.to_thread(headline_from_html, html) if html else None
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str, domain: str) -> str | None:
+        """GET ``url`` once the site's bucket and a global slot allow; None unless 200."""
+        await self._buckets[domain].acquire()
+        async with self._semaphore:
+            self._counts["requests"] += 1
+            try:
+                resp = await client.get(url)
+            except httpx.HTTPError as exc:
+                self._counts["errors"] += 1
+                logger.debug("GET %s failed: %s", url, exc)
+                return None
+        if resp.status_code != 200:
+            self._counts[f"status_{resp.status_code}"] += 1
+            return None
+        return resp.text
+
+    def _log_stats(self) -> None:
+        seconds = time.perf_counter() - self._started
+        self.stats = {**self._counts, "seconds": round(seconds, 2)}
+        logger.info(
+            "Crawled %d URLs in %.1fs (%.1f req/s): %s",
+            self._counts["requests"], seconds, self._counts["requests"] / max(seconds, 1e-9), self.stats,
+        )
+
+
+# ── Parsing ──────────────────────────────────────────────────
+
+def headline_from_html(html: str) -> str | None:
+    soup = BeautifulSoup(html, "lxml")
+    og = soup.find("meta", property="og:title")
+    if og and og.get("content"):
+        return og["content"].strip()
+    title = soup.find("title")
+    if title:
+        return title.get_text().strip()
+    h1 = soup.find("h1")
+    if h1:
+        return h1.get_text().strip()
+    return None
+
+
+def gather_links(base_url: str, html: str) -> set:
+    soup = BeautifulSoup(html, "lxml")
+    links: set = set()
+    base_domain = urlparse(base_url).netloc
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if href.startswith(("mailto:", "javascript:")):
+            continue
+        full = urljoin(base_url, href)
+        if urlparse(full).netloc.endswith(base_domain):
+            links.add(full.split("?")[0].rstrip("/"))
+    return links
+
+
+def _row(title: str, url: str, domain: str, info: dict) -> dict:
+    return {"headline": title, "url": url, "source": domain, "category": info["category"]}
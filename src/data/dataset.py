@@ -0,0 +1,129 @@
+"""
+Processed dataset – Columnar, memory-mapped training data.
+==========================================================
+The preprocessor writes the balanced dataset twice: the CSV for people
+and an Arrow IPC file for the trainers and evaluator. The IPC file holds
+everything they used to recompute on every load:
+
+  bias     – 3-class label name (``map_5_to_3`` of ``category``)
+  label    – 3-class label id (``LABEL_MAP_INV``), int8
+  gate     – ``PoliticalFilter.classify_many`` code of the headline,
+             indexing ``FILTER_RESULTS``, int8
+  split    – "train" or "test". A row is in test when a hash of its
+             ``clean_headline`` falls in the bottom ``DATASET_TEST_SIZE``
+             of the hash range, so a headline keeps its split across
+             rebuilds and every consumer sees the same split.
+
+The file is written uncompressed, so ``load_dataset`` memory-maps it:
+only the columns asked for are paged in, and nothing is parsed. The
+schema metadata records a format version; files from another version
+are rejected with a pointer to ``run.py preprocess``.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import DATASET_TEST_SIZE, LABEL_MAP_INV, PROCESSED_DATASET, map_5_to_3
+
+logger = logging.getLogger(__name__)
+
+DATASET_VERSION = 1
+SPLITS = ("train", "test")
+
+_SPLIT_HASH_KEY = "bias-split-key01"   # 16 bytes; independent of the balancing hash
+_VERSION_KEY = b"bias_spectra.dataset_version"
+
+
+# ── Public API ───────────────────────────────────────────────
+
+def build_dataset(df: pd.DataFrame, test_size: float = DATASET_TEST_SIZE) -> pd.DataFrame:
+    """
+    Add ``bias``, ``label``, ``gate`` and ``split`` to processed rows
+    (``headline``, ``clean_headline``, ``category`` and friends).
+    """
+    from src.political_filter import PoliticalFilter
+
+    # A missing category would stringify to "nan" and map to "Right"
+    category = df["category"].astype("string").str.strip()
+    unlabelled = category.isna() | (category == "")
+    if unlabelled.any():
+        logger.warning("Dropping %d rows without a category", int(unlabelled.sum()))
+    df = df[~unlabelled.to_numpy()].copy()
+
+    df["clean_headline"] = df["clean_headline"].fillna("").astype(str)
+    df["bias"] = category[~unlabelled].astype(str).map(map_5_to_3).to_numpy()
+    df["label"] = df["bias"].map(LABEL_MAP_INV).astype("int8")
+    df["gate"] = PoliticalFilter().classify_many(df["headline"]).astype("int8")
+
+    hashes = pd.util.hash_pandas_object(df["clean_headline"], index=False, hash_key=_SPLIT_HASH_KEY)
+    df["split"] = pd.Categorical.from_codes(
+        (hashes.to_numpy() < test_size * 2.0 ** 64).astype("int8"), categories=list(SPLITS)
+    )
+    return df
+
+
+def write_dataset(df: pd.DataFrame, path=PROCESSED_DATASET, test_size: float = DATASET_TEST_SIZE) -> Path:
+    """Build the dataset columns for ``df`` and write them as an Arrow IPC file."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = pa.Table.from_pandas(build_dataset(df, test_size), preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _VERSION_KEY: str(DATASET_VERSION).encode(),
+        b"bias_spectra.test_size": str(test_size).encode(),
+    })
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    feather.write_feather(table, tmp, compression="uncompressed")
+    os.replace(tmp, path)   # readers never see a half-written file
+    logger.info("Dataset v%d → %s (%d rows)", DATASET_VERSION, path, len(table))
+    return path
+
+
+def load_dataset(
+    path=PROCESSED_DATASET,
+    split: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Load the processed dataset, memory-mapped, optionally just one
+    ``split`` and some ``columns``.
+
+    A ``.csv`` path, or a missing IPC file with the processed CSV next
+    to it, is converted in memory instead (same columns, same split).
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    path = Path(path)
+    if path.suffix == ".csv" or (not path.exists() and path.with_suffix(".csv").exists()):
+        csv = path.with_suffix(".csv")
+        if path.suffix != ".csv":
+            logger.warning("%s not found – building the dataset from %s in memory", path, csv)
+        table = pa.Table.from_pandas(build_dataset(pd.read_csv(csv)), preserve_index=False)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        version = (table.schema.metadata or {}).get(_VERSION_KEY, b"?").decode()
+        if version != str(DATASET_VERSION):
+            raise ValueError(
+                f"{path} is dataset version {version}, expected {DATASET_VERSION} – "
+                "rebuild it with `python run.py preprocess`"
+            )
+
+    if split is not None:
+        if split not in SPLITS:
+            raise ValueError(f"Unknown split {split!r} (expected one of {SPLITS})")
+        table = table.filter(pc.equal(table["split"].cast(pa.string()), split))
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
@@ -0,0 +1,218 @@
+"""
+NearDuplicateDetector – MinHash + LSH near-duplicate headlines.
+===============================================================
+Syndicated headlines that differ by a word or a "| Latest News" suffix
+survive exact deduplication. This stage compares the word sets of
+cleaned headlines by Jaccard similarity without comparing every pair:
+
+  MinHash – each headline's word set becomes ``num_perm`` minimum hash
+            values; the share of equal values estimates Jaccard.
+  LSH     – signatures are cut into ``bands`` of ``rows`` values. Two
+            headlines become candidates when any whole band matches,
+            which is likely above the threshold and unlikely below it.
+
+Headlines are clustered greedily in arrival order: the first of a
+cluster is its representative and is kept; a later headline whose
+estimated Jaccard with a representative it collides with reaches the
+threshold joins that cluster and is dropped. Cost is linear in the
+number of headlines, and memory is one signature plus ``bands`` bucket
+entries per representative.
+"""
+
+import logging
+from collections import Counter
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import DEDUP_JACCARD_THRESHOLD, DEDUP_NUM_PERM
+
+logger = logging.getLogger(__name__)
+
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_SIGNATURE_BATCH_TOKENS = 20_000    # bounds the (num_perm × tokens) matrix
+
+
+class NearDuplicateDetector:
+    """
+    Streaming near-duplicate filter over cleaned headlines.
+
+    Usage:
+        detector = NearDuplicateDetector(threshold=0.7)
+        keep = detector.add(chunk["clean_headline"])   # bool mask, call per chunk
+        chunk = chunk[keep]
+        detector.stats()
+        # {"rows": ..., "duplicates": ..., "clusters": ..., "largest_cluster": ..., ...}
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEDUP_JACCARD_THRESHOLD,
+        num_perm: int = DEDUP_NUM_PERM,
+        seed: int = 42,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+
+        # Multiply-shift hash family: h(x) = (a·x + b) >> 32 mod 2^64, a odd
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False)
+
+        self._buckets = [dict() for _ in range(self.bands)]   # band key → representative id
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self._cluster_sizes = []                              # representative id → size
+        self._rows_seen = 0
+        self._duplicates = 0
+
+    # ── Public API ───────────────────────────────────────────
+
+    def add(self, clean_headlines) -> np.ndarray:
+        """
+        Feed the next headlines (already cleaned, e.g. ``clean_headline``)
+        in order. Returns a mask that is True for headlines to keep:
+        new representatives and headlines with no words.
+        """
+        texts = pd.Series(clean_headlines, dtype=object).fillna("").astype(str)
+        signatures, has_words = self.signatures(texts)
+        keys = self._band_keys(signatures)
+
+        keep = np.ones(len(texts), dtype=bool)
+        for i in np.flatnonzero(has_words):
+            rep = self._find(signatures[i], keys[i])
+            if rep is None:
+                self._insert(signatures[i], keys[i])
+            else:
+                self._cluster_sizes[rep] += 1
+                keep[i] = False
+
+        self._rows_seen += len(texts)
+        self._duplicates += int((~keep).sum())
+        return keep
+
+    def signatures(self, texts: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """MinHash signatures (uint32, one row per text) and which texts have words."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        words = pc.utf8_split_whitespace(pa.array(texts, type=pa.string(), from_pandas=True))
+        row = pc.list_parent_indices(words)
+        tokens = pc.list_flatten(words)
+        nonempty = pc.not_equal(tokens, "")
+        encoded = pc.dictionary_encode(tokens.filter(nonempty))
+        row = row.filter(nonempty).to_numpy().astype(np.int64)
+
+        # Word *sets*: one (row, word) pair per distinct word, sorted by row.
+        # Only the vocabulary is hashed, not every token.
+        vocabulary = encoded.dictionary.to_numpy(zero_copy_only=False)
+        codes = encoded.indices.to_numpy().astype(np.int64)
+        pairs = np.sort(row * max(1, len(vocabulary)) + codes)
+        pairs = pairs[_run_starts(pairs)]
+        row, codes = np.divmod(pairs, max(1, len(vocabulary)))
+        hashed = (pd.util.hash_array(vocabulary) & np.uint64(0xFFFFFFFF))[codes]
+
+        signatures = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        has_words = np.zeros(len(texts), dtype=bool)
+        has_words[row] = True
+
+        # Whole rows per batch, so each row's minimum is taken in one place;
+        # (num_perm × tokens) layout keeps the per-row reduction contiguous
+        start = 0
+        while start < len(row):
+            end = start + _SIGNATURE_BATCH_TOKENS
+            if end >= len(row):
+                end = len(row)
+            else:
+                end = int(np.searchsorted(row, row[end], side="left"))
+                if end <= start:  # one headline with more words than a batch
+                    end = int(np.searchsorted(row, row[start], side="right"))
+            batch_rows, batch_hashes = row[start:end], hashed[start:end]
+            permuted = (self._a[:, None] * batch_hashes + self._b[:, None]) >> np.uint64(32)
+            starts = np.flatnonzero(_run_starts(batch_rows))
+            minima = np.minimum.reduceat(permuted.astype(np.uint32), starts, axis=1)
+            signatures[batch_rows[starts]] = minima.T
+            start = end
+        return signatures, has_words
+
+    def stats(self) -> dict:
+        """Rows seen, duplicates dropped and the cluster size distribution."""
+        sizes = [s for s in self._cluster_sizes if s > 1]
+        return {
+            "rows": self._rows_seen,
+            "duplicates": self._duplicates,
+            "clusters": len(sizes),
+            "largest_cluster": max(sizes, default=1),
+            "cluster_sizes": dict(sorted(Counter(sizes).items())),
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows_per_band": self.rows,
+        }
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One 64-bit key per (headline, band), from the band's values."""
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for band in range(self.bands):
+                for col in range(band * self.rows, (band + 1) * self.rows):
+                    keys[:, band] = keys[:, band] * _BAND_MULTIPLIER + signatures[:, col]
+        return keys
+
+    def _find(self, signature: np.ndarray, keys: np.ndarray) -> Optional[int]:
+        tried = set()
+        for band, key in enumerate(keys.tolist()):
+            rep = self._buckets[band].get(key)
+            if rep is None or rep in tried:
+                continue
+            tried.add(rep)
+            agreement = np.count_nonzero(self._signatures[rep] == signature) / self.num_perm
+            if agreement >= self.threshold:
+                return rep
+        return None
+
+    def _insert(self, signature: np.ndarray, keys: np.ndarray) -> None:
+        rep = len(self._cluster_sizes)
+        if rep == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+        self._signatures[rep] = signature
+        self._cluster_sizes.append(1)
+        for band, key in enumerate(keys.tolist()):
+            self._buckets[band].setdefault(key, rep)
+
+
+def _run_starts(sorted_values: np.ndarray) -> np.ndarray:
+    """Mask of positions whose value differs from the previous one."""
+    starts = np.ones(len(sorted_values), dtype=bool)
+    starts[1:] = sorted_values[1:] != sorted_values[:-1]
+    return starts
+
+
+def _lsh_params(
+    threshold: float, num_perm: int, false_positive_weight: float = 0.1
+) -> Tuple[int, int]:
+    """
+    Bands × rows (≤ num_perm) minimising the weighted false-positive and
+    false-negative areas of the banding S-curve around the threshold.
+    Candidates are verified against the signature, so a false positive
+    only costs a comparison; missed pairs are weighted more.
+    """
+    s = np.linspace(0.0, 1.0, 1001)
+    best, best_error = (1, num_perm), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        candidate = 1 - (1 - s ** rows) ** bands
+        error = np.where(
+            s < threshold,
+            false_positive_weight * candidate,
+            (1 - false_positive_weight) * (1 - candidate),
+        ).mean()
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
@@ -0,0 +1,146 @@
+"""
+PreprocessManifest – State carried between incremental preprocessing runs.
+==========================================================================
+``run.py preprocess --incremental`` only cleans, labels and deduplicates
+raw rows it has not processed before. This SQLite file remembers:
+
+  raw_rows   – content hash of every raw row already processed; a
+               re-scraped row is skipped before cleaning
+  headlines  – content key of every clean headline kept so far, so exact
+               deduplication holds across runs
+  sample     – the per-class and overflow bottom-k reservoirs. Bottom-k
+               samples merge exactly: adding new rows to the stored
+               sample gives the sample a full run would have built
+  state      – class counts, the near-duplicate detector and the settings
+               the state was built with; changed settings start it afresh
+
+The key sets live in ``state`` as one sorted uint64 array each (8 bytes
+per key) and are checked with a vectorised binary search, so a chunk
+costs no per-row Python or SQL work.
+
+Everything a run records is committed in one transaction after its
+outputs are written, so a crash leaves the previous state intact and
+the next run simply redoes the new rows.
+"""
+
+import json
+import logging
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+_KEY_SETS = ("raw_rows", "headlines")
+_OVERFLOW = ""   # sample pool name of the overflow reservoir
+
+
+class PreprocessManifest:
+    """
+    Processed-row manifest and balancing state for incremental runs.
+
+    Usage:
+        manifest = PreprocessManifest("manifest.sqlite", settings={"target_total": 1500})
+        reservoirs, overflow, distribution, detector = manifest.load_sample()
+        fresh = manifest.unseen("raw_rows", row_hashes)     # bool mask, records them
+        ...
+        manifest.save_sample(reservoirs, overflow, distribution, detector)
+        manifest.commit()
+    """
+
+    def __init__(self, path, settings: dict) -> None:
+        self.path = Path(path)
+        self.settings = {"version": MANIFEST_VERSION, **settings}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path))
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (name TEXT PRIMARY KEY, value)")
+
+        stored = self._get("settings")
+        if stored is not None and json.loads(stored) != self.settings:
+            logger.warning("Preprocessing settings changed since %s was built – starting afresh", self.path)
+            self._reset()
+        self._db.commit()
+
+        # Per key set: keys from earlier runs, and keys added by this run
+        self._known = {name: np.frombuffer(self._get(name) or b"", dtype=np.uint64) for name in _KEY_SETS}
+        self._added = {name: np.empty(0, dtype=np.uint64) for name in _KEY_SETS}
+
+    # ── Public API ───────────────────────────────────────────
+
+    def unseen(self, name: str, keys) -> np.ndarray:
+        """
+        Mask of ``keys`` (uint64 content hashes) not in key set ``name``
+        and not earlier in ``keys``; the new ones are added to the set.
+        """
+        if name not in _KEY_SETS:
+            raise ValueError(f"Unknown manifest key set {name!r} (expected one of {_KEY_SETS})")
+        keys = np.asarray(keys, dtype=np.uint64)
+        fresh = ~pd.Series(keys).duplicated().to_numpy()
+        fresh &= ~_contains(self._known[name], keys) & ~_contains(self._added[name], keys)
+        # Disjoint from both sets by construction, so a sort is enough to merge
+        self._added[name] = np.sort(np.concatenate([self._added[name], keys[fresh]]))
+        return fresh
+
+    def load_sample(self) -> Tuple[dict, pd.DataFrame, dict, object]:
+        """Stored reservoirs by class, the overflow reservoir, class counts and detector."""
+        reservoirs, overflow = {}, None
+        if self._get("distribution") is not None:
+            stored = pd.read_sql("SELECT * FROM sample", self._db)
+            stored["_key"] = stored["_key"].to_numpy().view(np.uint64)
+            for pool, rows in stored.groupby("_pool", sort=False):
+                rows = rows.drop(columns="_pool").reset_index(drop=True)
+                if pool == _OVERFLOW:
+                    overflow = rows
+                else:
+                    reservoirs[pool] = rows
+        distribution = json.loads(self._get("distribution") or "{}")
+        detector = self._get("detector")
+        return reservoirs, overflow, distribution, pickle.loads(detector) if detector else None
+
+    def save_sample(self, reservoirs: dict, overflow: pd.DataFrame, distribution: dict, detector) -> None:
+        """Replace the stored key sets, reservoirs, class counts and detector."""
+        for name in _KEY_SETS:
+            self._set(name, np.sort(np.concatenate([self._known[name], self._added[name]])).tobytes())
+        self._set("distribution", json.dumps({cls: int(n) for cls, n in distribution.items()}))
+        self._set("detector", pickle.dumps(detector) if detector is not None else None)
+        self._set("settings", json.dumps(self.settings))
+
+        pools = [rows.assign(_pool=cls) for cls, rows in reservoirs.items()]
+        pools.append(overflow.assign(_pool=_OVERFLOW))
+        sample = pd.concat(pools, ignore_index=True)
+        sample["_key"] = sample["_key"].to_numpy(dtype=np.uint64).view(np.int64)
+        # Last: to_sql commits, and must commit the rows above with it
+        sample.to_sql("sample", self._db, if_exists="replace", index=False)
+
+    def commit(self) -> None:
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _get(self, name: str):
+        row = self._db.execute("SELECT value FROM state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set(self, name: str, value) -> None:
+        self._db.execute("INSERT OR REPLACE INTO state VALUES (?, ?)", (name, value))
+
+    def _reset(self) -> None:
+        self._db.execute("DELETE FROM state")
+        self._db.execute("DROP TABLE IF EXISTS sample")
+
+
+def _contains(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Membership of ``keys`` in a sorted array, by binary search."""
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return sorted_keys[positions] == keys
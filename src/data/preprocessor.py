@@ -3,26 +3,66 @@ DataPreprocessor – Clean and balance scraped headline data.
 ===========================================================
 Handles text cleaning, 5→3 class label mapping, class balancing,
 and deduplication. Config-driven paths and targets.
+
+The raw CSV is streamed in chunks of ``PREPROCESS_CHUNK_SIZE`` rows, so
+memory is bounded by the chunk, the balanced sample being built and the
+dedup keys – a set of Python ints, one per unique headline, or packed
+8-byte arrays in an incremental run's manifest:
+
+  clean     – ``clean_series``, Arrow string kernels over the chunk
+  dedup     – first occurrence of each ``clean_headline`` wins, across
+              all chunks, via a set of 64-bit content hashes; then
+              near-duplicates (``NearDuplicateDetector``, MinHash + LSH)
+              of an earlier headline are dropped too
+  balance   – bottom-k sampling per class: every row's sort key is its
+              content hash, and each class keeps the ``per_class`` rows
+              with the smallest keys seen so far. Shortfalls are filled
+              from a global bottom-k in the same way.
+
+Keys come from the content rather than an RNG, so the sample does not
+depend on the chunk size. It does depend on the order of the raw rows
+where deduplication picks a survivor: the first copy of a headline
+(with its source and URL) is kept, and of two near-duplicates the one
+read first stays while the other is dropped.
+
+The balanced rows are saved as the processed CSV and as the Arrow
+dataset the trainers load (``src.data.dataset``).
+
+With a ``manifest_path`` the run is incremental: raw rows processed by
+an earlier run are skipped before cleaning, and the dedup keys, class
+counts and reservoirs carry over (``src.data.manifest``), so a daily
+refresh costs a read of the raw CSV plus work on its new rows only.
 """
 
 import logging
 import math
 import re
+import sys
+from functools import lru_cache
+from pathlib import Path
 
 import pandas as pd
 
-import sys, os
+import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 from config import (
+    DEDUP_JACCARD_THRESHOLD,
+    DEDUP_NUM_PERM,
+    PREPROCESS_CHUNK_SIZE,
     PROCESSED_CSV,
-    PROCESSED_DIR,
+    PROCESSED_DATASET,
     RAW_CSV,
     SCRAPE_TARGET_TOTAL,
     map_5_to_3,
 )
+from src.data.dataset import write_dataset
+from src.data.dedup import NearDuplicateDetector
+from src.data.manifest import PreprocessManifest
 
 logger = logging.getLogger(__name__)
 
+OUTPUT_COLUMNS = ["headline", "clean_headline", "url", "source", "category", "bias"]
+
 
 class DataPreprocessor:
     """
@@ -30,7 +70,13 @@ class DataPreprocessor:
 
     Usage:
         preprocessor = DataPreprocessor()
-        df = preprocessor.run()  # returns DataFrame and saves CSV
+        df = preprocessor.run()  # returns DataFrame, saves CSV + Arrow dataset
+
+        # multi-GB dumps: smaller chunks bound memory further
+        DataPreprocessor(raw_csv="dump.csv", chunk_size=50_000).run()
+
+        # daily refresh: only rows not seen by earlier runs are processed
+        DataPreprocessor(manifest_path=PREPROCESS_MANIFEST).run()
     """
 
     def __init__(
@@ -38,34 +84,91 @@ class DataPreprocessor:
         raw_csv=RAW_CSV,
         out_csv=PROCESSED_CSV,
         target_total: int = SCRAPE_TARGET_TOTAL,
+        chunk_size: int = PREPROCESS_CHUNK_SIZE,
+        near_duplicate_threshold: float = DEDUP_JACCARD_THRESHOLD,
+        dataset_path=PROCESSED_DATASET,
+        manifest_path=None,
     ) -> None:
         self.raw_csv = raw_csv
         self.out_csv = out_csv
+        self.dataset_path = dataset_path
+        self.manifest_path = manifest_path
         self.target_total = target_total
+        self.chunk_size = chunk_size
+        self.near_duplicate_threshold = near_duplicate_threshold
 
     # ── Public ───────────────────────────────────────────────
 
     def run(self) -> pd.DataFrame:
-        """Full pipeline: load → clean → map labels → balance → save."""
-        df = pd.read_csv(self.raw_csv)
-        logger.info("Raw rows loaded: %d", len(df))
+        """Full pipeline: stream → clean → map labels → dedup → balance → save."""
+        seen: set = set()
+        reservoirs: dict = {}          # class → bottom-k sample so far
+        overflow = _empty_sample()     # global bottom-k, for filling short classes
+        counts = {"raw": 0, "already_processed": 0, "duplicates": 0, "near_duplicates": 0}
+        distribution: dict = {}
+        detector = None
 
-        df = df[df["headline"].notna()].copy()
-        df["clean_headline"] = df["headline"].apply(self.clean_text)
+        manifest = None
+        if self.manifest_path is not None:
+            manifest = PreprocessManifest(self.manifest_path, settings={
+                "target_total": self.target_total,
+                "near_duplicate_threshold": self.near_duplicate_threshold,
+                "num_perm": DEDUP_NUM_PERM,
+            })
+            seen = manifest
+            reservoirs, stored_overflow, distribution, detector = manifest.load_sample()
+            if stored_overflow is not None:
+                overflow = stored_overflow
+        if detector is None and self.near_duplicate_threshold < 1:
+            detector = NearDuplicateDetector(threshold=self.near_duplicate_threshold)
 
-        # Map original 5-class to 3-class
-        df["category"] = df["category"].str.strip()
-        df["bias"] = df["category"].apply(map_5_to_3)
+        for chunk in pd.read_csv(self.raw_csv, chunksize=self.chunk_size):
+            counts["raw"] += len(chunk)
+            if manifest is not None:
+                hashes = pd.util.hash_pandas_object(chunk, index=False, categorize=False)
+                fresh = manifest.unseen("raw_rows", hashes)
+                counts["already_processed"] += len(chunk) - int(fresh.sum())
+                chunk = chunk[fresh]
+            chunk = self._prepare(chunk)
+            chunk = self._deduplicate(chunk, seen, counts)
+            if detector is not None:
+                keep = detector.add(chunk["clean_headline"])
+                counts["near_duplicates"] += int((~keep).sum())
+                chunk = chunk[keep]
+            for cls, n in chunk["bias"].value_counts().items():
+                distribution[cls] = distribution.get(cls, 0) + n
+
+            per_class = math.ceil(self.target_total / max(1, len(distribution)))
+            for cls, rows in chunk.groupby("bias", sort=False):
+                reservoirs[cls] = _bottom_k(reservoirs.get(cls, _empty_sample()), rows, per_class)
+            overflow = _bottom_k(overflow, chunk, self.target_total)
+            logger.info(
+                "Preprocessed %d raw rows (%d new unique)", counts["raw"],
+                counts["raw"] - counts["already_processed"] - counts["duplicates"] - counts["near_duplicates"],
+            )
 
-        logger.info("Distribution before balancing: %s", df["bias"].value_counts().to_dict())
+        logger.info(
+            "Raw rows: %d, already processed: %d, duplicates dropped: %d, near-duplicates dropped: %d",
+            counts["raw"], counts["already_processed"], counts["duplicates"], counts["near_duplicates"],
+        )
+        if detector is not None:
+            logger.info("Near-duplicate clusters: %s", detector.stats())
+        logger.info("Distribution before balancing: %s", distribution)
 
-        df = self._balance(df)
-        df = df.drop_duplicates(subset=["clean_headline"])
-        df = df[["headline", "clean_headline", "url", "source", "category", "bias"]]
+        df = self._balance(reservoirs, overflow)
+        df = df[OUTPUT_COLUMNS]
 
-        PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
+        Path(self.out_csv).parent.mkdir(parents=True, exist_ok=True)
         df.to_csv(self.out_csv, index=False)
         logger.info("Saved → %s (%d rows)", self.out_csv, len(df))
+        if self.dataset_path is not None:
+            write_dataset(df, self.dataset_path)
+
+        if manifest is not None:
+            manifest.save_sample(reservoirs, overflow, distribution, detector)
+            manifest.commit()
+            manifest.close()
+            logger.info("Manifest → %s", self.manifest_path)
         logger.info("Final distribution: %s", df["bias"].value_counts().to_dict())
         return df
 
@@ -84,31 +187,106 @@ class DataPreprocessor:
         text = re.sub(r"\s+", " ", text).strip()
         return text
 
+    @staticmethod
+    def clean_series(texts: pd.Series) -> pd.Series:
+        """
+        ``clean_text`` over a whole column with Arrow string kernels,
+        identical row for row.
+
+        Only ASCII alphanumerics survive cleaning, so the steps reduce to:
+        lowercase, drop ``http\\S+`` runs, turn every other run of
+        non-``[a-z0-9]`` characters into one space, trim. Arrow's case
+        mapping differs from ``str.lower`` outside ASCII (``"İ"`` lowers
+        to ``"i̇"`` in Python), so non-ASCII rows are lowercased in Python;
+        and RE2's ``\\S`` is ASCII-only, so Python's whitespace set is
+        spelled out for the URL rule.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        array = pa.array(texts.where(texts.notna(), "").astype(str), type=pa.string())
+        lowered = pc.ascii_lower(array)
+        others = pc.invert(pc.string_is_ascii(array))
+        if pc.any(others).as_py():
+            rest = [t.lower() for t in array.filter(others).to_pylist()]
+            lowered = pc.replace_with_mask(lowered, others, pa.array(rest, type=pa.string()))
+
+        cleaned = pc.replace_substring_regex(lowered, f"http[^{_whitespace_class()}]+", " ")
+        cleaned = pc.replace_substring_regex(cleaned, "[^a-z0-9]+", " ")
+        cleaned = pc.utf8_trim(cleaned, " ")
+        return pd.Series(cleaned.to_numpy(zero_copy_only=False), index=texts.index, dtype=object)
+
+    # ── Chunk steps ──────────────────────────────────────────
+
+    def _prepare(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Clean headlines, map labels and attach each row's content hash."""
+        chunk = chunk[chunk["headline"].notna()].copy()
+        chunk["clean_headline"] = self.clean_series(chunk["headline"])
+
+        # Map original 5-class to 3-class
+        chunk["category"] = chunk["category"].str.strip()
+        chunk["bias"] = chunk["category"].map(map_5_to_3)
+
+        chunk["_key"] = pd.util.hash_pandas_object(chunk["clean_headline"], index=False).to_numpy()
+        return chunk
+
+    @staticmethod
+    def _deduplicate(chunk: pd.DataFrame, seen, counts: dict) -> pd.DataFrame:
+        """
+        Keep the first row per clean headline, within and across chunks.
+        ``seen`` is a set of keys, or the manifest to also drop headlines
+        kept by earlier runs.
+        """
+        if isinstance(seen, PreprocessManifest):
+            fresh = seen.unseen("headlines", chunk["_key"]).tolist()
+        else:
+            fresh = []
+            for key in chunk["_key"].tolist():
+                fresh.append(key not in seen)
+                seen.add(key)
+        counts["duplicates"] += len(fresh) - sum(fresh)
+        return chunk[pd.Series(fresh, index=chunk.index, dtype=bool)]
+
     # ── Balancing ────────────────────────────────────────────
 
-    def _balance(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _balance(self, reservoirs: dict, overflow: pd.DataFrame) -> pd.DataFrame:
         """Equalize class sizes via undersampling + optional overflow fill."""
-        classes = sorted(df["bias"].unique())
-        per_class = math.ceil(self.target_total / len(classes))
+        classes = sorted(reservoirs)
+        per_class = math.ceil(self.target_total / max(1, len(classes)))
         logger.info("Balancing → %d per class (%s)", per_class, classes)
 
-        parts = []
-        for cls in classes:
-            sub = df[df["bias"] == cls]
-            sample = sub.sample(n=min(per_class, len(sub)), random_state=42)
-            parts.append(sample)
-
-        balanced = pd.concat(parts, ignore_index=True)
+        # Samples were capped at the per_class known when each chunk arrived,
+        # which only shrinks as classes appear; trim to the final figure
+        parts = [reservoirs[cls].head(per_class) for cls in classes]
+        balanced = pd.concat(parts, ignore_index=True) if parts else _empty_sample()
 
         # Fill shortage from remaining rows
         if len(balanced) < self.target_total:
             needed = self.target_total - len(balanced)
-            remaining = df[~df.index.isin(balanced.index)]
-            if len(remaining) > 0:
-                fill = remaining.sample(n=min(needed, len(remaining)), random_state=42)
-                balanced = pd.concat([balanced, fill], ignore_index=True)
+            remaining = overflow[~overflow["_key"].isin(balanced["_key"])]
+            balanced = pd.concat([balanced, remaining.head(needed)], ignore_index=True)
+
+        return balanced.drop(columns="_key")
+
+
+# ── Internals ────────────────────────────────────────────────
+
+def _empty_sample() -> pd.DataFrame:
+    return pd.DataFrame({"_key": pd.Series(dtype="uint64")})
+
+
+def _bottom_k(sample: pd.DataFrame, rows: pd.DataFrame, k: int) -> pd.DataFrame:
+    """The ``k`` rows with the smallest ``_key`` among a sample and new rows."""
+    merged = rows if sample.empty else pd.concat([sample, rows], ignore_index=True)
+    return merged.nsmallest(k, "_key", keep="first").reset_index(drop=True)
+
 
-        return balanced
+@lru_cache(maxsize=None)
+def _whitespace_class() -> str:
+    """Every character Python's ``\\s`` matches, as RE2 class members."""
+    return "".join(
+        f"\\x{{{code:X}}}" for code in range(sys.maxunicode + 1) if chr(code).isspace()
+    )
 
 
 if __name__ == "__main__":
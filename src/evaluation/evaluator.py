@@ -24,11 +24,10 @@ from config import (
     BERT_MODEL_DIR,
     BERT_MODEL_NAME,
     LABEL_MAP,
-    LABEL_MAP_INV,
     MODELS_DIR,
-    PROCESSED_CSV,
-    map_5_to_3,
+    PROCESSED_DATASET,
 )
+from src.data.dataset import load_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +42,11 @@ class ModelEvaluator:
         evaluator = ModelEvaluator()
         evaluator.evaluate_baseline()
         evaluator.evaluate_bert()
+        evaluator.evaluate_onnx_agreement()
+        evaluator.evaluate_cascade()
     """
 
-    def __init__(self, data_path=PROCESSED_CSV) -> None:
+    def __init__(self, data_path=PROCESSED_DATASET) -> None:
         self.data_path = data_path
 
     def evaluate_baseline(self) -> dict:
@@ -75,7 +76,7 @@ class ModelEvaluator:
         model.eval()
 
         X_test = df["clean_headline"].tolist()
-        y_true = df["bias"].apply(lambda x: LABEL_MAP_INV[x]).tolist()
+        y_true = df["label"].tolist()
 
         y_pred = []
         with torch.no_grad():
@@ -93,14 +94,97 @@ class ModelEvaluator:
 
         return self._report("bert", y_true_labels, y_pred_labels)
 
+    def evaluate_onnx_agreement(self, limit: int | None = None) -> dict:
+        """
+        Check the ONNX backend against the PyTorch NLI path.
+
+        Both predictors score the same dataset headlines; the PyTorch
+        labels are treated as ground truth, so the report reads as
+        "how often does ONNX reproduce the PyTorch call".
+        """
+        from src.inference.cache import PredictionCache
+        from src.inference.predictor import BiasPredictor
+
+        logger.info("Checking ONNX agreement with the PyTorch NLI model...")
+        df = load_dataset(self.data_path, columns=["headline"]).dropna(subset=["headline"])
+        headlines = df["headline"].astype(str).tolist()[:limit]
+
+        # Caches off so both paths really run the model
+        reference = BiasPredictor("nli", cache=PredictionCache(max_entries=0)).predict_batch(headlines)
+        candidate = BiasPredictor("onnx", cache=PredictionCache(max_entries=0)).predict_batch(headlines)
+
+        modelled = [(r, c) for r, c in zip(reference, candidate) if r.is_model_prediction]
+        agree = sum(r.label == c.label for r, c in modelled)
+        max_delta = max(
+            (abs(r.confidence[k] - c.confidence[k]) for r, c in modelled for k in r.confidence),
+            default=0.0,
+        )
+        logger.info(
+            "ONNX agreement: %d/%d model-routed headlines (%.1f%%), max confidence delta %.4f",
+            agree, len(modelled), 100 * agree / max(1, len(modelled)), max_delta,
+        )
+
+        report = self._report(
+            "onnx_agreement", [r.label for r in reference], [c.label for c in candidate]
+        )
+        report["model_routed"] = len(modelled)
+        report["model_routed_agreement"] = agree / len(modelled) if modelled else 1.0
+        report["max_confidence_delta"] = max_delta
+        return report
+
+    def evaluate_cascade(
+        self, margins=(0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5), limit: int | None = None
+    ) -> dict:
+        """
+        Sweep the cascade's baseline margin to tune cost vs. accuracy.
+
+        Baseline and NLI both score every model-routed headline once;
+        for each margin we report the share escalated to NLI and how
+        often the cascade's label matches pure NLI.
+        """
+        from src.inference.cache import PredictionCache
+        from src.inference.predictor import BiasPredictor
+
+        logger.info("Sweeping cascade margins %s...", list(margins))
+        df = load_dataset(self.data_path, columns=["headline"]).dropna(subset=["headline"])
+        headlines = df["headline"].astype(str).tolist()[:limit]
+
+        nli = BiasPredictor("nli", cache=PredictionCache(max_entries=0))
+        routed = [h for h in headlines if nli.gate(h) is None]
+        nli_results = nli.predict_batch(routed)
+        baseline = BiasPredictor("baseline", cache=PredictionCache(max_entries=0))
+        baseline_results = baseline.predict_batch(routed)
+
+        sweep = []
+        for margin in margins:
+            accepted = [
+                (b, n) for b, n in zip(baseline_results, nli_results)
+                if BiasPredictor._top2_margin(b.confidence) >= margin
+            ]
+            escalated = len(routed) - len(accepted)
+            matches = escalated + sum(b.label == n.label for b, n in accepted)
+            sweep.append({
+                "margin": margin,
+                "escalation_rate": escalated / len(routed) if routed else 0.0,
+                "agreement_with_nli": matches / len(routed) if routed else 1.0,
+            })
+            logger.info(
+                "margin %.2f → %.1f%% escalated, %.1f%% agree with NLI",
+                margin, 100 * sweep[-1]["escalation_rate"], 100 * sweep[-1]["agreement_with_nli"],
+            )
+
+        report = {"model_routed": len(routed), "sweep": sweep}
+        out_path = MODELS_DIR / "cascade_sweep_report.json"
+        with open(out_path, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info("Report saved → %s", out_path)
+        return report
+
     # ── Helpers ──────────────────────────────────────────────
 
     def _load_data(self) -> pd.DataFrame:
-        df = pd.read_csv(self.data_path)
-        df = df.dropna(subset=["clean_headline", "category"])
-        df["bias"] = df["category"].apply(map_5_to_3)
-        # Use 20% as test set (same split seed as training)
-        return df.sample(frac=0.2, random_state=42)
+        # The persisted test split – the rows the trainers held out
+        return load_dataset(self.data_path, split="test", columns=["clean_headline", "bias", "label"])
 
     @staticmethod
     def _resolve_bert_path(checkpoint: str | None) -> str:
@@ -0,0 +1,186 @@
+"""
+LoadTester – Replay PredictRequest payloads against the API.
+============================================================
+Sends ``/api/predict`` requests either to a running server (``url``) or
+to the app in-process via httpx's ASGI transport (models load through
+the app's own lifespan first). Two traffic shapes:
+
+  concurrency – closed loop: N clients each send their next request as
+                soon as the previous one returns.
+  qps         – open loop: requests start on a fixed schedule whatever
+                the server does; latency counts from the scheduled start,
+                so a backed-up server is not flattered (no coordinated
+                omission).
+
+The report has throughput, p50/p95/p99 latency, error rate, status codes
+and the gate mix of successful responses. Save it as JSON to compare
+serving changes on the same traffic.
+"""
+
+import asyncio
+import json
+import logging
+import statistics
+import time
+from collections import Counter
+from typing import List, Optional
+
+import httpx
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import PROCESSED_CSV
+from src.metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+
+def load_payloads(path=None, model: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+    """
+    PredictRequest payloads from a JSONL file (one object with at least
+    ``headline`` per line), or built from the processed dataset's
+    headlines when ``path`` is None. ``model`` overrides every payload.
+    """
+    if path is None:
+        import pandas as pd
+
+        headlines = pd.read_csv(PROCESSED_CSV)["headline"].dropna().astype(str).tolist()
+        payloads = [{"headline": h} for h in headlines]
+    else:
+        payloads, skipped = [], 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if isinstance(record, dict) and isinstance(record.get("headline"), str):
+                    payloads.append(record)
+                else:
+                    skipped += 1
+        if skipped:
+            logger.warning("Skipped %d lines without a headline in %s", skipped, path)
+    if model:
+        payloads = [{**p, "model": model} for p in payloads]
+    if not payloads:
+        raise ValueError(f"No PredictRequest payloads in {path or PROCESSED_CSV}")
+    return payloads[:limit]
+
+
+class LoadTester:
+    """
+    Drive /api/predict with recorded or synthetic payloads.
+
+    Usage:
+        tester = LoadTester(load_payloads(), url="http://127.0.0.1:8000", concurrency=16)
+        report = tester.run(count=2000)
+        LoadTester.print_report(report)
+    """
+
+    def __init__(
+        self,
+        payloads: List[dict],
+        url: Optional[str] = None,
+        concurrency: int = 8,
+        qps: Optional[float] = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self.payloads = payloads
+        self.url = url
+        self.concurrency = concurrency
+        self.qps = qps
+        self.timeout = timeout
+        self._samples = []   # (latency_s, status, gate_or_error)
+
+    # ── Public API ───────────────────────────────────────────
+
+    def run(self, count: Optional[int] = None) -> dict:
+        """Send ``count`` requests (default: one per payload, cycling) and report."""
+        return asyncio.run(self.run_async(count or len(self.payloads)))
+
+    async def run_async(self, count: int) -> dict:
+        self._samples = []
+        if self.url:
+            async with httpx.AsyncClient(base_url=self.url, timeout=self.timeout) as client:
+                elapsed = await self._drive(client, count)
+        else:
+            from src.app import app, readiness
+
+            # Run the app's lifespan so models preload exactly as in production
+            async with app.router.lifespan_context(app):
+                while not (readiness["ready"] or readiness["error"]):
+                    await asyncio.sleep(0.1)
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(
+                    transport=transport, base_url="http://loadtest", timeout=self.timeout
+                ) as client:
+                    elapsed = await self._drive(client, count)
+        return self._report(elapsed)
+
+    @staticmethod
+    def print_report(report: dict) -> None:
+        lat = report["latency_ms"]
+        print(f"\n{'─' * 50}")
+        print(f"  Target     : {report['target']} ({report['mode']})")
+        print(f"  Requests   : {report['requests']} in {report['seconds']:.1f}s")
+        print(f"  Throughput : {report['throughput_rps']:.1f} req/s")
+        print(f"  Latency    : p50 {lat['p50']:.1f}  p95 {lat['p95']:.1f}  p99 {lat['p99']:.1f}  max {lat['max']:.1f} ms")
+        print(f"  Errors     : {report['error_rate']:.2%}  {report['status_codes']}")
+        print("  Gate mix   : " + ", ".join(f"{g} {share:.1%}" for g, share in report["gate_mix"].items()))
+        print(f"{'─' * 50}\n")
+
+    # ── Internals ────────────────────────────────────────────
+
+    async def _drive(self, client: httpx.AsyncClient, count: int) -> float:
+        started = time.perf_counter()
+        if self.qps:
+            tasks = []
+            for i in range(count):
+                scheduled = started + i / self.qps
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                payload = self.payloads[i % len(self.payloads)]
+                tasks.append(asyncio.create_task(self._send(client, payload, scheduled)))
+            await asyncio.gather(*tasks)
+        else:
+            counter = iter(range(count))
+
+            async def worker():
+                for i in counter:
+                    await self._send(client, self.payloads[i % len(self.payloads)], time.perf_counter())
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return time.perf_counter() - started
+
+    async def _send(self, client: httpx.AsyncClient, payload: dict, started: float) -> None:
+        try:
+            response = await client.post("/api/predict", json=payload)
+            outcome = response.json().get("gate", "") if response.status_code == 200 else ""
+            status = response.status_code
+        except (httpx.HTTPError, ValueError) as e:
+            status, outcome = 0, type(e).__name__
+        self._samples.append((time.perf_counter() - started, status, outcome))
+
+    def _report(self, elapsed: float) -> dict:
+        latencies = sorted(s[0] * 1000 for s in self._samples)
+        statuses = Counter(s[1] for s in self._samples)
+        ok = [s for s in self._samples if s[1] == 200]
+        gates = Counter(s[2] for s in ok)
+        n = len(self._samples)
+        return {
+            "target": self.url or "in-process",
+            "mode": f"qps={self.qps}" if self.qps else f"concurrency={self.concurrency}",
+            "requests": n,
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+            "error_rate": round(1 - len(ok) / n, 4) if n else 0.0,
+            "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+            "gate_mix": {g: round(c / len(ok), 4) for g, c in gates.most_common()},
+        }
@@ -0,0 +1,51 @@
+"""
+Model backends – one lazily imported module per model type.
+===========================================================
+Each backend module imports its own heavy dependencies (torch,
+transformers, onnxruntime, sklearn/joblib), so a process only pays for
+the backend it actually loads. BiasPredictor resolves backends through
+``load_backend`` on first use.
+
+Every backend class loads its artifacts in ``__init__`` and exposes
+``predict_batch(headlines) -> List[BiasResult]``.
+"""
+
+import importlib
+import os
+
+# model_type → (module, class)
+BACKENDS = {
+    "nli": ("src.inference.backends.nli", "NLIBackend"),
+    "onnx": ("src.inference.backends.onnx_nli", "OnnxNLIBackend"),
+    "bert": ("src.inference.backends.bert", "BertBackend"),
+    "baseline": ("src.inference.backends.baseline", "BaselineBackend"),
+}
+
+# Model types whose forward pass runs on torch's intra-op thread pool
+TORCH_MODELS = {"nli", "bert", "cascade"}
+
+# Start method for processes that load a backend: fork is unsafe once
+# torch threads exist
+WORKER_START_METHOD = "spawn"
+
+
+def import_backend(model_type: str) -> type:
+    """Import a backend module and return its class, without loading weights."""
+    if model_type not in BACKENDS:
+        raise ValueError(f"Unknown model type: {model_type!r} (expected one of {sorted(BACKENDS)})")
+    module_name, class_name = BACKENDS[model_type]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_backend(model_type: str):
+    """Import and instantiate (i.e. load) the backend for ``model_type``."""
+    return import_backend(model_type)()
+
+
+def pin_threads(model_type: str, num_threads: int) -> None:
+    """Cap a worker process's BLAS/OpenMP (and torch) threads before its backend loads."""
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["MKL_NUM_THREADS"] = str(num_threads)
+    if model_type in TORCH_MODELS:
+        import torch
+        torch.set_num_threads(num_threads)
@@ -0,0 +1,49 @@
+"""
+Baseline backend – TF-IDF + Logistic Regression (legacy).
+=========================================================
+"""
+
+import logging
+from typing import List
+
+import joblib
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+from config import BASELINE_MODEL, BASELINE_TFIDF
+from src.inference.predictor import BiasResult
+from src.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class BaselineBackend:
+    """sklearn classifier over a fitted TF-IDF vectorizer."""
+
+    def __init__(self) -> None:
+        self.model = joblib.load(BASELINE_MODEL)
+        self.vectorizer = joblib.load(BASELINE_TFIDF)
+        logger.info("Loaded baseline model from %s", BASELINE_MODEL)
+
+    def predict_batch(self, headlines: List[str]) -> List[BiasResult]:
+        with STAGE_SECONDS.time(model="baseline", stage="tokenize"):
+            vec = self.vectorizer.transform(headlines)
+        with STAGE_SECONDS.time(model="baseline", stage="forward"):
+            preds = self.model.predict(vec)
+            probas = self.model.predict_proba(vec)
+        classes = self.model.classes_
+
+        results = []
+        with STAGE_SECONDS.time(model="baseline", stage="aggregate"):
+            for pred, proba in zip(preds, probas):
+                confidence = {cls: round(float(p), 4) for cls, p in zip(classes, proba)}
+                for lbl in ("Left", "Neutral", "Right"):
+                    confidence.setdefault(lbl, 0.0)
+
+                results.append(BiasResult(
+                    label=pred,
+                    confidence=confidence,
+                    gate="model",
+                    reasoning=f"Baseline model prediction ({confidence[pred]:.1%} confidence)",
+                ))
+        return results
@@ -0,0 +1,64 @@
+"""
+BERT backend – Fine-tuned multilingual BERT (legacy).
+=====================================================
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import List
+
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+from config import BERT_MAX_LENGTH, BERT_MODEL_DIR, BERT_MODEL_NAME, LABEL_MAP
+from src.inference.predictor import BiasResult
+from src.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class BertBackend:
+    """3-class BERT sequence classifier."""
+
+    def __init__(self) -> None:
+        model_path = self._resolve_bert_path()
+        self.tokenizer = AutoTokenizer.from_pretrained(BERT_MODEL_NAME)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        self.model.eval()
+        logger.info("Loaded BERT model from %s", model_path)
+
+    def predict_batch(self, headlines: List[str]) -> List[BiasResult]:
+        with STAGE_SECONDS.time(model="bert", stage="tokenize"):
+            inputs = self.tokenizer(
+                headlines, return_tensors="pt",
+                truncation=True, padding=True, max_length=BERT_MAX_LENGTH,
+            )
+        with STAGE_SECONDS.time(model="bert", stage="forward"), torch.no_grad():
+            outputs = self.model(**inputs)
+            all_probs = torch.softmax(outputs.logits, dim=1)
+
+        results = []
+        with STAGE_SECONDS.time(model="bert", stage="aggregate"):
+            for probs in all_probs:
+                pred_idx = torch.argmax(probs).item()
+                confidence = {LABEL_MAP[i]: round(probs[i].item(), 4) for i in LABEL_MAP}
+                results.append(BiasResult(
+                    label=LABEL_MAP[pred_idx],
+                    confidence=confidence,
+                    gate="model",
+                    reasoning=f"BERT model prediction ({confidence[LABEL_MAP[pred_idx]]:.1%} confidence)",
+                ))
+        return results
+
+    @staticmethod
+    def _resolve_bert_path() -> str:
+        bert_dir = Path(BERT_MODEL_DIR)
+        if (bert_dir / "config.json").exists():
+            return str(bert_dir)
+        checkpoints = sorted(bert_dir.glob("checkpoint-*"), key=os.path.getmtime)
+        if checkpoints:
+            return str(checkpoints[-1])
+        raise FileNotFoundError(f"No BERT model found in {bert_dir}")
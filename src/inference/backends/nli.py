@@ -0,0 +1,93 @@
+"""
+NLI backend – Zero-shot DeBERTa scoring (primary model).
+========================================================
+Scores each headline against every NLI hypothesis with NLIEngine,
+averages entailment per bias class and applies the confidence-gap
+rule that sends ambiguous framing to Neutral.
+"""
+
+import logging
+from typing import List
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+from config import NLI_CONFIDENCE_THRESHOLD, NLI_MODEL_NAME
+from src.inference.nli_engine import NLIEngine
+from src.inference.predictor import BiasResult
+from src.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class NLIBackend:
+    """Multi-hypothesis NLI classification on top of an NLIEngine."""
+
+    def __init__(self, engine: NLIEngine | None = None) -> None:
+        if engine is None:
+            logger.info("Loading NLI model: %s (this may take a moment)...", NLI_MODEL_NAME)
+            engine = NLIEngine.from_pretrained(NLI_MODEL_NAME)  # CPU
+            logger.info("NLI model loaded successfully.")
+        self.engine = engine
+
+    def predict_batch(self, headlines: List[str]) -> List[BiasResult]:
+        """
+        For each bias class, we test multiple hypotheses and average
+        the entailment scores. The class with the highest aggregated
+        score wins — unless the gap is too small, in which case we
+        default to Neutral (ambiguous framing).
+        """
+        # Score every (headline, hypothesis) pair in one padded forward pass
+        scores = self.engine.score(headlines)
+        classes = self.engine.classes
+
+        results = []
+        with STAGE_SECONDS.time(model=self.engine.metrics_label, stage="aggregate"):
+            for row in scores:
+                # Aggregate scores per class (average of hypothesis scores)
+                class_scores = {"Left": 0.0, "Neutral": 0.0, "Right": 0.0}
+                class_counts = {"Left": 0, "Neutral": 0, "Right": 0}
+
+                for cls, score in zip(classes, row):
+                    class_scores[cls] += float(score)
+                    class_counts[cls] += 1
+
+                results.append(self.aggregate(class_scores, class_counts))
+        return results
+
+    @staticmethod
+    def aggregate(class_scores: dict, class_counts: dict) -> BiasResult:
+        """Turn summed per-class entailment scores into a BiasResult."""
+        # Average per class
+        for cls in class_scores:
+            if class_counts[cls] > 0:
+                class_scores[cls] /= class_counts[cls]
+
+        # Normalize to sum to 1
+        total = sum(class_scores.values())
+        if total > 0:
+            confidence = {cls: round(s / total, 4) for cls, s in class_scores.items()}
+        else:
+            confidence = {"Left": 0.33, "Neutral": 0.34, "Right": 0.33}
+
+        # Determine prediction
+        sorted_classes = sorted(confidence.items(), key=lambda x: x[1], reverse=True)
+        top_label, top_score = sorted_classes[0]
+        second_score = sorted_classes[1][1]
+
+        # If confidence gap is too small → Neutral (ambiguous)
+        if (top_score - second_score) < NLI_CONFIDENCE_THRESHOLD:
+            label = "Neutral"
+            reasoning = (
+                f"NLI analysis: ambiguous framing "
+                f"(gap {top_score - second_score:.1%} < threshold {NLI_CONFIDENCE_THRESHOLD:.0%})"
+            )
+        else:
+            label = top_label
+            reasoning = f"NLI analysis: {label} framing detected ({confidence[label]:.1%} confidence)"
+
+        return BiasResult(
+            label=label,
+            confidence=confidence,
+            gate="model",
+            reasoning=reasoning,
+        )
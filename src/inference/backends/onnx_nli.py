@@ -0,0 +1,18 @@
+"""
+ONNX NLI backend – the NLI model on ONNX Runtime (CPU).
+=======================================================
+Same hypotheses and aggregation as the NLI backend; the forward pass
+runs on the export written by ``run.py export``. Does not import torch.
+"""
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+from src.inference.backends.nli import NLIBackend
+from src.inference.onnx_backend import OnnxNLIEngine
+
+
+class OnnxNLIBackend(NLIBackend):
+    """NLIBackend backed by OnnxNLIEngine."""
+
+    def __init__(self) -> None:
+        super().__init__(OnnxNLIEngine.from_pretrained())
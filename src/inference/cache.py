@@ -0,0 +1,216 @@
+"""
+PredictionCache – Two-tier cache for model predictions.
+=======================================================
+Tier 1 is an in-process LRU bounded by entry count and TTL.
+Tier 2 is an optional SQLite file that survives restarts; entries
+found there are promoted back into the LRU.
+
+Keys combine the model type, a fingerprint of everything that changes
+that model's output and the normalized headline, so syndicated copies of
+one wire headline share a single entry, while a change to the hypotheses,
+the cascade margin, the ONNX export or a retrained model file
+invalidates old results.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import (
+    BASELINE_MODEL,
+    BASELINE_TFIDF,
+    BERT_MODEL_DIR,
+    CACHE_DB_PATH,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+    CASCADE_BASELINE_MARGIN,
+    NLI_CONFIDENCE_THRESHOLD,
+    NLI_HYPOTHESES,
+    NLI_HYPOTHESIS_TEMPLATE,
+    NLI_MODEL_NAME,
+    ONNX_MODEL_DIR,
+    ONNX_USE_QUANTIZED,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def settings_fingerprint(model_type: str = "nli") -> str:
+    """Short hash of every setting and artifact that changes ``model_type`` output."""
+    nli = {
+        "model": NLI_MODEL_NAME,
+        "hypotheses": NLI_HYPOTHESES,
+        "template": NLI_HYPOTHESIS_TEMPLATE,
+        "threshold": NLI_CONFIDENCE_THRESHOLD,
+        "artifacts": _artifact_stamp(NLI_MODEL_NAME),   # local model directories only
+    }
+    baseline = {"artifacts": _artifact_stamp(BASELINE_MODEL, BASELINE_TFIDF)}
+
+    if model_type == "nli":
+        settings = nli
+    elif model_type == "onnx":
+        settings = {**nli, "quantized": ONNX_USE_QUANTIZED, "export": _artifact_stamp(ONNX_MODEL_DIR)}
+    elif model_type == "cascade":
+        settings = {"nli": nli, "baseline": baseline, "margin": CASCADE_BASELINE_MARGIN}
+    elif model_type == "baseline":
+        settings = baseline
+    elif model_type == "bert":
+        settings = {"artifacts": _artifact_stamp(BERT_MODEL_DIR)}
+    else:
+        settings = {}
+    blob = json.dumps({"model_type": model_type, **settings}, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def _artifact_stamp(*paths) -> list:
+    """(path, size, mtime) of every file under ``paths``; missing paths are skipped."""
+    stamp = []
+    for path in map(Path, paths):
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            stamp.append([str(file), stat.st_size, stat.st_mtime_ns])
+    return stamp
+
+
+class PredictionCache:
+    """
+    LRU + TTL cache of prediction dicts, with an optional SQLite tier.
+
+    Usage:
+        cache = PredictionCache(max_entries=10_000, ttl=3600, db_path="cache.sqlite")
+        key = cache.key(headline, "nli")
+        hit = cache.get(key)          # dict or None
+        cache.put(key, {"label": "Left", ...})
+        cache.put_many(zip(keys, values))   # one SQLite commit
+        cache.stats()                 # {"hits": ..., "misses": ..., ...}
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        ttl: float = CACHE_TTL_SECONDS,
+        db_path=CACHE_DB_PATH,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_path = Path(db_path) if db_path else None
+        self._fingerprints: dict = {}   # model type → settings_fingerprint, computed on first use
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db() if self.db_path else None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ── Public API ───────────────────────────────────────────
+
+    def key(self, headline: str, model_type: str) -> str:
+        # Imported here so gate-only CLI runs never pay for pandas
+        from src.data.preprocessor import DataPreprocessor
+
+        fingerprint = self._fingerprints.get(model_type)
+        if fingerprint is None:
+            fingerprint = self._fingerprints[model_type] = settings_fingerprint(model_type)
+        return f"{model_type}:{fingerprint}:{DataPreprocessor.clean_text(headline)}"
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, value FROM predictions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[0] <= self.ttl:
+                    value = json.loads(row[1])
+                    self._remember(key, row[0], value)
+                    self.disk_hits += 1
+                    return copy.deepcopy(value)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: dict) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items) -> None:
+        """Store ``(key, value)`` pairs, with one SQLite commit for all of them."""
+        now = time.time()
+        items = [(key, copy.deepcopy(value)) for key, value in items]
+        with self._lock:
+            for key, value in items:
+                self._remember(key, now, value)
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, stored_at, value) VALUES (?, ?, ?)",
+                    [(key, now, json.dumps(value)) for key, value in items],
+                )
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+    def reopen(self) -> None:
+        """Fresh lock and SQLite connection, e.g. in a forked child."""
+        self._lock = threading.Lock()
+        if self.db_path:
+            self._db = self._open_db()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM predictions")
+                self._db.commit()
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _remember(self, key: str, stored_at: float, value: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _open_db(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS predictions "
+            "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        db.execute("DELETE FROM predictions WHERE stored_at < ?", (time.time() - self.ttl,))
+        db.commit()
+        logger.info("Prediction cache persisted at %s", self.db_path)
+        return db
@@ -0,0 +1,154 @@
+"""
+NLIEngine – Direct cross-encoder scoring for multi-hypothesis NLI.
+==================================================================
+Replaces the generic transformers zero-shot pipeline on the hot path.
+Hypotheses are tokenized once at load time; each call only tokenizes
+the premises, pairs them with the cached hypothesis encodings and runs
+a single padded forward pass. torch and transformers are imported
+on use, so the ONNX subclass runs without them on the hot path.
+
+Scores match the zero-shot pipeline with ``multi_label=True``: the
+hypothesis template is the pipeline default and each pair is scored by
+a softmax over its contradiction/entailment logits.
+"""
+
+import logging
+from typing import Dict, List
+
+import numpy as np
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import NLI_HYPOTHESES, NLI_HYPOTHESIS_TEMPLATE, NLI_MODEL_NAME
+from src.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class NLIEngine:
+    """
+    Score headlines against a fixed set of NLI hypotheses.
+
+    Usage:
+        engine = NLIEngine.from_pretrained(NLI_MODEL_NAME)
+        scores = engine.score(["Opposition criticizes govt on farm laws"])
+        # scores.shape == (1, len(engine.hypotheses)); columns follow engine.classes
+    """
+
+    # Backend label on the tokenize/forward stage metrics
+    metrics_label = "nli"
+
+    def __init__(
+        self,
+        tokenizer,
+        model,
+        hypotheses: Dict[str, List[str]] = NLI_HYPOTHESES,
+        template: str = NLI_HYPOTHESIS_TEMPLATE,
+        config=None,
+    ) -> None:
+        self.tokenizer = tokenizer
+        self.model = model
+        self.config = config if config is not None else model.config
+        if hasattr(model, "eval"):
+            model.eval()
+
+        # Flatten {class: [hypothesis, ...]} once, keeping class alignment
+        self.hypotheses: List[str] = []
+        self.classes: List[str] = []
+        for cls, hyps in hypotheses.items():
+            for h in hyps:
+                self.hypotheses.append(h)
+                self.classes.append(cls)
+
+        self._backend = tokenizer.backend_tokenizer
+        self._hypothesis_encodings = [
+            self._backend.encode(template.format(h), add_special_tokens=False)
+            for h in self.hypotheses
+        ]
+        self._pad_id = tokenizer.pad_token_id or 0
+        self._use_token_types = "token_type_ids" in tokenizer.model_input_names
+        self._max_length = min(
+            tokenizer.model_max_length,
+            getattr(self.config, "max_position_embeddings", tokenizer.model_max_length),
+        )
+        self._num_special = tokenizer.num_special_tokens_to_add(pair=True)
+
+        # Same label resolution as the zero-shot pipeline
+        self.entailment_id = next(
+            (i for lbl, i in self.config.label2id.items() if lbl.lower().startswith("entail")), -1
+        )
+        if self.entailment_id == -1:
+            raise ValueError(f"No entailment label in model config: {self.config.label2id}")
+        self.contradiction_id = -1 if self.entailment_id == 0 else 0
+
+    @classmethod
+    def from_pretrained(cls, model_name: str = NLI_MODEL_NAME, **kwargs) -> "NLIEngine":
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        return cls(tokenizer, model, **kwargs)
+
+    # ── Public API ───────────────────────────────────────────
+
+    def score(self, premises: List[str]) -> np.ndarray:
+        """
+        Entailment probability of every hypothesis for every premise.
+
+        Returns an array of shape (len(premises), len(self.hypotheses)).
+        """
+        if not premises:
+            return np.zeros((0, len(self.hypotheses)), dtype=np.float32)
+
+        with STAGE_SECONDS.time(model=self.metrics_label, stage="tokenize"):
+            inputs = self._build_pairs(premises)
+        with STAGE_SECONDS.time(model=self.metrics_label, stage="forward"):
+            logits = self._forward(inputs)
+        logits = logits.reshape(len(premises), len(self.hypotheses), -1)
+
+        # Softmax over [contradiction, entailment] for each pair independently
+        pair_logits = logits[..., [self.contradiction_id, self.entailment_id]]
+        pair_logits = pair_logits - pair_logits.max(axis=-1, keepdims=True)
+        exp = np.exp(pair_logits)
+        return exp[..., 1] / exp.sum(axis=-1)
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _build_pairs(self, premises: List[str]) -> Dict[str, np.ndarray]:
+        """Pair each premise with every cached hypothesis into padded arrays."""
+        premise_encodings = self._backend.encode_batch(premises, add_special_tokens=False)
+        post = self._backend.post_processor
+
+        pairs = []
+        for text, premise in zip(premises, premise_encodings):
+            for hyp in self._hypothesis_encodings:
+                # Truncate only the premise, as the pipeline does
+                budget = self._max_length - len(hyp.ids) - self._num_special
+                if len(premise.ids) > budget:
+                    truncated = self._backend.encode(text, add_special_tokens=False)
+                    truncated.truncate(budget)
+                    pairs.append(post.process(truncated, hyp, add_special_tokens=True))
+                else:
+                    pairs.append(post.process(premise, hyp, add_special_tokens=True))
+
+        width = max(len(p.ids) for p in pairs)
+        input_ids = np.full((len(pairs), width), self._pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(pairs), width), dtype=np.int64)
+        token_type_ids = np.zeros((len(pairs), width), dtype=np.int64)
+        for row, pair in enumerate(pairs):
+            n = len(pair.ids)
+            input_ids[row, :n] = pair.ids
+            attention_mask[row, :n] = 1
+            token_type_ids[row, :n] = pair.type_ids
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if self._use_token_types:
+            inputs["token_type_ids"] = token_type_ids
+        return inputs
+
+    def _forward(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        import torch
+
+        with torch.inference_mode():
+            tensors = {k: torch.from_numpy(v) for k, v in inputs.items()}
+            return self.model(**tensors).logits.float().numpy()
@@ -0,0 +1,130 @@
+"""
+ONNX backend – CPU-optimized NLI inference via ONNX Runtime.
+============================================================
+``export_onnx`` writes the NLI cross-encoder to ONNX (optionally with
+dynamic int8 weight quantization) alongside its tokenizer and config.
+``OnnxNLIEngine`` loads that directory and scores headlines exactly
+like ``NLIEngine``, with ONNX Runtime doing the forward pass.
+
+Requires ``onnx`` and ``onnxruntime`` (see requirements.txt); both are
+imported lazily, so the other backends never load them.
+"""
+
+import inspect
+import logging
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import NLI_MODEL_NAME, ONNX_MODEL_DIR, ONNX_USE_QUANTIZED
+from src.inference.nli_engine import NLIEngine
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILENAME = "model.onnx"
+ONNX_INT8_FILENAME = "model.int8.onnx"
+
+
+def export_onnx(
+    model_name: str = NLI_MODEL_NAME,
+    out_dir=ONNX_MODEL_DIR,
+    quantize: bool = False,
+    opset: int = 17,
+) -> Path:
+    """
+    Export the NLI model to ``out_dir``. Returns the path of the model
+    the ONNX backend will load (the int8 one when ``quantize`` is set).
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.info("Loading %s for export...", model_name)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    engine = NLIEngine(tokenizer, model)
+
+    # Trace with real premise/hypothesis pairs so every input is exercised
+    sample = engine._build_pairs(["Opposition criticizes government over farm laws"])
+    input_names = list(sample)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        export_kwargs["dynamo"] = False  # TorchScript exporter handles dynamic_axes
+
+    fp32_path = out_dir / ONNX_FILENAME
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (),
+            str(fp32_path),
+            kwargs={k: torch.from_numpy(v) for k, v in sample.items()},
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            **export_kwargs,
+        )
+    tokenizer.save_pretrained(out_dir)
+    model.config.save_pretrained(out_dir)
+    logger.info("ONNX model → %s", fp32_path)
+
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = out_dir / ONNX_INT8_FILENAME
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info("Int8 model → %s", int8_path)
+    return int8_path
+
+
+class OnnxNLIEngine(NLIEngine):
+    """
+    NLIEngine whose forward pass runs on ONNX Runtime (CPU).
+
+    Usage:
+        engine = OnnxNLIEngine.from_pretrained(ONNX_MODEL_DIR)
+        scores = engine.score(["Opposition criticizes govt on farm laws"])
+    """
+
+    metrics_label = "onnx"
+
+    @classmethod
+    def from_pretrained(
+        cls, model_dir=ONNX_MODEL_DIR, quantized: bool = ONNX_USE_QUANTIZED, **kwargs
+    ) -> "OnnxNLIEngine":
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        model_dir = Path(model_dir)
+        model_path = model_dir / ONNX_INT8_FILENAME
+        if not (quantized and model_path.exists()):
+            model_path = model_dir / ONNX_FILENAME
+        if not model_path.exists():
+            raise FileNotFoundError(
+                f"No ONNX model in {model_dir} – run `python run.py export` first"
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        logger.info("Loaded ONNX model from %s", model_path)
+
+        tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        config = AutoConfig.from_pretrained(model_dir)
+        return cls(tokenizer, session, config=config, **kwargs)
+
+    def _forward(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        feed = {i.name: inputs[i.name] for i in self.model.get_inputs()}
+        return self.model.run(["logits"], feed)[0].astype(np.float32)
@@ -6,35 +6,35 @@ Fallback: Fine-tuned BERT or TF-IDF baseline (legacy).
 
 The NLI approach tests multiple hypotheses about political framing
 and aggregates scores for a balanced Left/Neutral/Right prediction.
+
+Model backends live in ``src.inference.backends`` and are imported on
+first use, so gate-only and baseline-only paths never import torch.
 """
 
 import logging
 import os
 import sys
-from dataclasses import dataclass, field
-from pathlib import Path
-
-import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
-
-import joblib
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Tuple
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 from config import (
-    BASELINE_MODEL,
-    BASELINE_TFIDF,
-    BERT_MAX_LENGTH,
-    BERT_MODEL_DIR,
-    BERT_MODEL_NAME,
-    LABEL_MAP,
-    NLI_CONFIDENCE_THRESHOLD,
-    NLI_HYPOTHESES,
-    NLI_MODEL_NAME,
+    CASCADE_BASELINE_MARGIN,
+    PREDICT_BATCH_SIZE,
+    WARMUP_HEADLINES,
 )
-from src.political_filter import FilterResult, PoliticalFilter
+from src.inference.cache import PredictionCache
+from src.metrics import GATE_TOTAL, MODEL_LOAD_SECONDS, STAGE_SECONDS, collect_timings
+from src.political_filter import FILTER_RESULTS, FilterResult, PoliticalFilter
 
 logger = logging.getLogger(__name__)
 
+# Gates whose result came from an ML model rather than a keyword rule
+MODEL_GATES = {"model", "cascade_baseline", "cascade_nli", "deadline_baseline"}
+
 
 @dataclass
 class BiasResult:
@@ -43,10 +43,11 @@ class BiasResult:
     confidence: dict = field(default_factory=dict)      # {label: probability}
     gate: str = ""                                      # which gate triggered
     reasoning: str = ""                                 # human-readable explanation
+    timings: Optional[dict] = None                      # "<model>.<stage>" → ms, batch_size (on request)
 
     @property
     def is_model_prediction(self) -> bool:
-        return self.gate == "model"
+        return self.gate in MODEL_GATES
 
 
 class BiasPredictor:
@@ -55,6 +56,8 @@ class BiasPredictor:
 
     model_type options:
       - "nli"      (default, recommended) – Zero-shot DeBERTa NLI
+      - "onnx"     – Same NLI model exported to ONNX Runtime (CPU, optional int8)
+      - "cascade"  – TF-IDF baseline first, NLI only when the baseline is unsure
       - "bert"     (legacy) – Fine-tuned multilingual BERT
       - "baseline" (legacy) – TF-IDF + Logistic Regression
 
@@ -62,45 +65,51 @@ class BiasPredictor:
         predictor = BiasPredictor(model_type="nli")
         result = predictor.predict("Opposition criticizes govt on farm laws")
         print(result.label, result.confidence)
+
+        results = predictor.predict_batch(headlines)  # same order as input
     """
 
-    def __init__(self, model_type: str = "nli") -> None:
+    def __init__(self, model_type: str = "nli", cache: Optional[PredictionCache] = None) -> None:
         self.filter = PoliticalFilter()
         self.model_type = model_type
-        self._model = None
-        self._tokenizer = None
-        self._vectorizer = None
-        self._nli_pipeline = None
+        self.cache = cache if cache is not None else PredictionCache()
+        self._backends = {}
+        self._load_lock = threading.Lock()
+        self.cascade_stats = {"baseline": 0, "nli": 0}
 
     def _load_model(self) -> None:
-        """Lazy-load the ML model on first prediction."""
-        if self.model_type == "nli" and self._nli_pipeline is not None:
-            return
-        if self.model_type != "nli" and self._model is not None:
-            return
-
-        if self.model_type == "nli":
-            logger.info("Loading NLI model: %s (this may take a moment)...", NLI_MODEL_NAME)
-            self._nli_pipeline = pipeline(
-                "zero-shot-classification",
-                model=NLI_MODEL_NAME,
-                device=-1,  # CPU; set to 0 for GPU
-            )
-            logger.info("NLI model loaded successfully.")
-
-        elif self.model_type == "bert":
-            model_path = self._resolve_bert_path()
-            self._tokenizer = AutoTokenizer.from_pretrained(BERT_MODEL_NAME)
-            self._model = AutoModelForSequenceClassification.from_pretrained(model_path)
-            self._model.eval()
-            logger.info("Loaded BERT model from %s", model_path)
+        """Lazy-load the ML backend on first prediction."""
+        if self.model_type == "cascade":
+            self._load_backend("baseline")  # NLI loads on first escalation
+        else:
+            self._load_backend(self.model_type)
 
-        else:  # baseline
-            self._model = joblib.load(BASELINE_MODEL)
-            self._vectorizer = joblib.load(BASELINE_TFIDF)
-            logger.info("Loaded baseline model from %s", BASELINE_MODEL)
+    def _load_backend(self, model_type: str):
+        """
+        Import and load a backend once; later calls reuse it. Concurrent
+        first callers wait on the lock instead of loading their own copy.
+        """
+        backend = self._backends.get(model_type)
+        if backend is None:
+            with self._load_lock:
+                backend = self._backends.get(model_type)
+                if backend is None:
+                    from src.inference.backends import load_backend
+                    start = time.perf_counter()
+                    backend = self._backends[model_type] = load_backend(model_type)
+                    MODEL_LOAD_SECONDS.set(time.perf_counter() - start, model=model_type)
+        return backend
+
+    def warmup(self, headlines: List[str] = WARMUP_HEADLINES) -> None:
+        """Load the model and run it once so the first real request is not cold."""
+        self._load_model()
+        if self.model_type == "cascade":
+            self._predict_nli_batch(headlines)
+        self._predict_model_batch(headlines)  # bypasses the cache on purpose
+        self.cascade_stats = {"baseline": 0, "nli": 0}
+        logger.info("Warmed up %s model on %d headlines", self.model_type, len(headlines))
 
-    def predict(self, headline: str) -> BiasResult:
+    def predict(self, headline: str, timings: bool = False) -> BiasResult:
         """
         Predict bias for a single headline.
 
@@ -108,10 +117,123 @@ class BiasPredictor:
           Gate 1: Non-political → Neutral
           Gate 2: Political but no bias keywords → Neutral
           Gate 3: ML model inference
+
+        With ``timings`` the result carries its stage breakdown in ms.
+        """
+        if timings:
+            with collect_timings() as seconds:
+                result = self.predict(headline)
+            result.timings = {**_to_ms(seconds), "batch_size": int(result.is_model_prediction)}
+            return result
+
+        gated = self.gate(headline)
+        if gated is not None:
+            return gated
+
+        # Gate 3: ML model (cached on the normalized headline)
+        key = self.cache.key(headline, self.model_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return BiasResult(**cached)
+
+        self._load_model()
+        result = self._predict_model_batch([headline])[0]
+        self.cache.put(key, asdict(result))
+        return result
+
+    def predict_batch(
+        self, headlines: List[str], batch_size: int = PREDICT_BATCH_SIZE, timings: bool = False
+    ) -> List[BiasResult]:
+        """
+        Predict bias for many headlines, returned in input order.
+
+        Every headline is gated first (column-wise via ``classify_many``);
+        only the BIASED_POLITICAL subset that misses the cache reaches the
+        model, in padded batches of ``batch_size``. With ``timings`` each
+        headline is gated on its own so its result can carry its filter
+        time plus the stages of the model batch it ran in.
+        """
+        results: List[Optional[BiasResult]] = []
+        gate_seconds = []
+        if timings:
+            for headline in headlines:
+                with collect_timings() as seconds:
+                    results.append(self.gate(headline))
+                gate_seconds.append(seconds)
+        else:
+            results, _ = self.gate_many(headlines)
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if pending:
+            modelled = self.predict_gated_batch([headlines[i] for i in pending], batch_size, timings)
+            for i, result in zip(pending, modelled):
+                results[i] = result
+
+        if timings:
+            for result, seconds in zip(results, gate_seconds):
+                result.timings = {**_to_ms(seconds), **(result.timings or {"batch_size": 0})}
+
+        logger.debug("Batch of %d: %d sent to %s model", len(headlines), len(pending), self.model_type)
+        return results
+
+    def predict_gated_batch(
+        self, headlines: List[str], batch_size: int = PREDICT_BATCH_SIZE, timings: bool = False
+    ) -> List[BiasResult]:
         """
-        gate_result = self.filter.classify(headline)
+        Cache → model for headlines that already failed every gate
+        (i.e. ``gate`` returned None), skipping a second filter pass.
+        With ``timings`` model results carry their batch's stage times
+        and ``batch_size`` (0 for cache hits).
+        """
+        results: List[Optional[BiasResult]] = [None] * len(headlines)
+        keys = [self.cache.key(h, self.model_type) for h in headlines]
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = BiasResult(**cached)
+                if timings:
+                    results[i].timings = {"batch_size": 0}
+
+        pending = [i for i, r in enumerate(results) if r is None]
+        if not pending:
+            return results
 
+        self._load_model()
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            with collect_timings() if timings else nullcontext({}) as seconds:
+                batch = self._predict_model_batch([headlines[i] for i in chunk])
+            self.cache.put_many((keys[i], asdict(result)) for i, result in zip(chunk, batch))
+            for i, result in zip(chunk, batch):
+                results[i] = result
+                if timings:
+                    result.timings = {**_to_ms(seconds), "batch_size": len(chunk)}
+        return results
+
+    def gate(self, headline: str) -> Optional[BiasResult]:
+        """Run the rule-based gates. Returns None when the model must decide."""
+        with STAGE_SECONDS.time(model=self.model_type, stage="filter"):
+            gate_result = self.filter.classify(headline)
+        return self._gated(gate_result)
+
+    def gate_many(self, headlines: List[str]) -> Tuple[List[Optional[BiasResult]], float]:
+        """
+        ``gate`` for many headlines in one vectorised ``classify_many``
+        pass. Returns the results and the filter seconds per headline.
+        """
+        start = time.perf_counter()
+        codes = self.filter.classify_many(headlines)
+        per_headline = (time.perf_counter() - start) / max(1, len(headlines))
+        results = []
+        for code in codes:
+            STAGE_SECONDS.observe(per_headline, model=self.model_type, stage="filter")
+            results.append(self._gated(FILTER_RESULTS[code]))
+        return results, per_headline
+
+    def _gated(self, gate_result: FilterResult) -> Optional[BiasResult]:
+        """The gate's answer for a filter outcome (counted), or None for the model."""
         if gate_result == FilterResult.NON_POLITICAL:
+            GATE_TOTAL.inc(model=self.model_type, gate="non_political")
             return BiasResult(
                 label="Neutral",
                 confidence={"Left": 0.0, "Neutral": 1.0, "Right": 0.0},
@@ -120,6 +242,7 @@ class BiasPredictor:
             )
 
         if gate_result == FilterResult.NEUTRAL_POLITICAL:
+            GATE_TOTAL.inc(model=self.model_type, gate="neutral_political")
             return BiasResult(
                 label="Neutral",
                 confidence={"Left": 0.0, "Neutral": 1.0, "Right": 0.0},
@@ -127,132 +250,90 @@ class BiasPredictor:
                 reasoning="Political topic with no ideological framing detected.",
             )
 
-        # Gate 3: ML model
-        self._load_model()
-
-        if self.model_type == "nli":
-            return self._predict_nli(headline)
-        elif self.model_type == "bert":
-            return self._predict_bert(headline)
-        return self._predict_baseline(headline)
+        GATE_TOTAL.inc(model=self.model_type, gate="model")
+        return None
 
-    # ── NLI Zero-Shot (Primary) ──────────────────────────────
-
-    def _predict_nli(self, headline: str) -> BiasResult:
+    def predict_fallback(self, headline: str) -> BiasResult:
         """
-        Multi-hypothesis NLI classification.
-
-        For each bias class, we test multiple hypotheses and average
-        the entailment scores. The class with the highest aggregated
-        score wins — unless the gap is too small, in which case we
-        default to Neutral (ambiguous framing).
+        Baseline answer for a model-bound headline whose deadline the
+        main model cannot meet. Marked ``deadline_baseline`` and never
+        cached under this predictor's model type.
         """
-        # Collect all hypotheses and track which class they belong to
-        all_hypotheses = []
-        hypothesis_to_class = {}
-        for cls, hyps in NLI_HYPOTHESES.items():
-            for h in hyps:
-                all_hypotheses.append(h)
-                hypothesis_to_class[h] = cls
-
-        # Run zero-shot on all hypotheses at once
-        result = self._nli_pipeline(
-            headline,
-            candidate_labels=all_hypotheses,
-            multi_label=True,  # each hypothesis scored independently
-        )
-
-        # Aggregate scores per class (average of hypothesis scores)
-        class_scores = {"Left": 0.0, "Neutral": 0.0, "Right": 0.0}
-        class_counts = {"Left": 0, "Neutral": 0, "Right": 0}
+        result = self._predict_baseline(headline)
+        if self.model_type != "baseline":
+            result.gate = "deadline_baseline"
+            result.reasoning = f"Deadline fallback from {self.model_type}: {result.reasoning}"
+        return result
+
+    def _predict_model_batch(self, headlines: List[str]) -> List[BiasResult]:
+        """Dispatch a batch of gated headlines to the loaded model."""
+        if self.model_type == "cascade":
+            return self._predict_cascade_batch(headlines)
+        return self._backends[self.model_type].predict_batch(headlines)
 
-        for label, score in zip(result["labels"], result["scores"]):
-            cls = hypothesis_to_class[label]
-            class_scores[cls] += score
-            class_counts[cls] += 1
+    def _predict_nli(self, headline: str) -> BiasResult:
+        return self._predict_nli_batch([headline])[0]
 
-        # Average per class
-        for cls in class_scores:
-            if class_counts[cls] > 0:
-                class_scores[cls] /= class_counts[cls]
+    def _predict_nli_batch(self, headlines: List[str]) -> List[BiasResult]:
+        return self._load_backend("nli").predict_batch(headlines)
 
-        # Normalize to sum to 1
-        total = sum(class_scores.values())
-        if total > 0:
-            confidence = {cls: round(s / total, 4) for cls, s in class_scores.items()}
-        else:
-            confidence = {"Left": 0.33, "Neutral": 0.34, "Right": 0.33}
-
-        # Determine prediction
-        sorted_classes = sorted(confidence.items(), key=lambda x: x[1], reverse=True)
-        top_label, top_score = sorted_classes[0]
-        second_score = sorted_classes[1][1]
-
-        # If confidence gap is too small → Neutral (ambiguous)
-        if (top_score - second_score) < NLI_CONFIDENCE_THRESHOLD:
-            label = "Neutral"
-            reasoning = (
-                f"NLI analysis: ambiguous framing "
-                f"(gap {top_score - second_score:.1%} < threshold {NLI_CONFIDENCE_THRESHOLD:.0%})"
-            )
-        else:
-            label = top_label
-            reasoning = f"NLI analysis: {label} framing detected ({confidence[label]:.1%} confidence)"
-
-        return BiasResult(
-            label=label,
-            confidence=confidence,
-            gate="model",
-            reasoning=reasoning,
-        )
+    def _predict_baseline(self, headline: str) -> BiasResult:
+        return self._predict_baseline_batch([headline])[0]
 
-    # ── BERT (Legacy) ────────────────────────────────────────
+    def _predict_baseline_batch(self, headlines: List[str]) -> List[BiasResult]:
+        return self._load_backend("baseline").predict_batch(headlines)
 
-    def _predict_bert(self, headline: str) -> BiasResult:
-        with torch.no_grad():
-            inputs = self._tokenizer(
-                headline, return_tensors="pt",
-                truncation=True, padding=True, max_length=BERT_MAX_LENGTH,
-            )
-            outputs = self._model(**inputs)
-            probs = torch.softmax(outputs.logits, dim=1)[0]
-            pred_idx = torch.argmax(probs).item()
-
-        confidence = {LABEL_MAP[i]: round(probs[i].item(), 4) for i in LABEL_MAP}
-        return BiasResult(
-            label=LABEL_MAP[pred_idx],
-            confidence=confidence,
-            gate="model",
-            reasoning=f"BERT model prediction ({confidence[LABEL_MAP[pred_idx]]:.1%} confidence)",
-        )
+    # ── Cascade (baseline → NLI) ─────────────────────────────
 
-    # ── Baseline (Legacy) ────────────────────────────────────
+    def _predict_cascade_batch(self, headlines: List[str]) -> List[BiasResult]:
+        """
+        Accept confident baseline calls; escalate the rest to NLI.
 
-    def _predict_baseline(self, headline: str) -> BiasResult:
-        vec = self._vectorizer.transform([headline])
-        pred = self._model.predict(vec)[0]
-        proba = self._model.predict_proba(vec)[0]
-        classes = self._model.classes_
-
-        confidence = {cls: round(float(p), 4) for cls, p in zip(classes, proba)}
-        for lbl in ("Left", "Neutral", "Right"):
-            confidence.setdefault(lbl, 0.0)
-
-        return BiasResult(
-            label=pred,
-            confidence=confidence,
-            gate="model",
-            reasoning=f"Baseline model prediction ({confidence[pred]:.1%} confidence)",
+        Confidence is the gap between the baseline's top two class
+        probabilities, compared against CASCADE_BASELINE_MARGIN.
+        """
+        results = self._predict_baseline_batch(headlines)
+
+        escalate = []
+        for i, result in enumerate(results):
+            margin = self._top2_margin(result.confidence)
+            if margin >= CASCADE_BASELINE_MARGIN:
+                result.gate = "cascade_baseline"
+                result.reasoning = (
+                    f"Cascade (baseline stage): {result.reasoning}, "
+                    f"margin {margin:.1%} ≥ {CASCADE_BASELINE_MARGIN:.0%}"
+                )
+            else:
+                escalate.append((i, margin))
+
+        if escalate:
+            escalated = self._predict_nli_batch([headlines[i] for i, _ in escalate])
+            for (i, margin), result in zip(escalate, escalated):
+                result.gate = "cascade_nli"
+                result.reasoning = (
+                    f"Cascade (NLI stage, baseline margin {margin:.1%} "
+                    f"< {CASCADE_BASELINE_MARGIN:.0%}): {result.reasoning}"
+                )
+                results[i] = result
+
+        self.cascade_stats["baseline"] += len(headlines) - len(escalate)
+        self.cascade_stats["nli"] += len(escalate)
+        logger.debug(
+            "Cascade: %d/%d escalated to NLI (%.1f%% overall)",
+            len(escalate), len(headlines), 100 * self.escalation_rate(),
         )
+        return results
 
-    # ── Helpers ──────────────────────────────────────────────
+    def escalation_rate(self) -> float:
+        """Share of cascade model calls that needed the NLI stage."""
+        total = self.cascade_stats["baseline"] + self.cascade_stats["nli"]
+        return self.cascade_stats["nli"] / total if total else 0.0
 
     @staticmethod
-    def _resolve_bert_path() -> str:
-        bert_dir = Path(BERT_MODEL_DIR)
-        if (bert_dir / "config.json").exists():
-            return str(bert_dir)
-        checkpoints = sorted(bert_dir.glob("checkpoint-*"), key=os.path.getmtime)
-        if checkpoints:
-            return str(checkpoints[-1])
-        raise FileNotFoundError(f"No BERT model found in {bert_dir}")
+    def _top2_margin(confidence: dict) -> float:
+        top, second = sorted(confidence.values(), reverse=True)[:2]
+        return top - second
+
+
+def _to_ms(seconds: dict) -> dict:
+    return {stage: round(value * 1000, 3) for stage, value in seconds.items()}
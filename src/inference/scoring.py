@@ -0,0 +1,318 @@
+"""
+BulkScorer – Offline scoring of large headline files.
+=====================================================
+Streams a CSV, JSONL or Parquet file in fixed-size chunks, runs every
+chunk through BiasPredictor (gates → cache → batched model) in a pool
+of worker processes, and writes one part file per chunk.
+
+Each part is written to a temp name and renamed when complete, so an
+existing part is a finished chunk. A killed job re-run with the same
+arguments skips those chunks and continues. When every chunk is done,
+CSV/JSONL parts are merged into the output file. Parquet output stays a
+directory of parts, which pandas and pyarrow read as one dataset.
+
+Output rows keep every input column and add the BiasResult fields:
+label, confidence (flattened to ``confidence_<Label>`` columns except in
+JSONL), gate, reasoning and is_model_prediction. Parquet parts are all
+cast to one schema – the input's for passthrough columns (a Parquet
+input's own schema, else the first chunk's), fixed types for the result
+columns – so a chunk of nulls cannot change a part's column types.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import multiprocessing as mp
+import pandas as pd
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import PREDICT_BATCH_SIZE, SCORE_CHUNK_SIZE
+from src.inference.backends import WORKER_START_METHOD, pin_threads
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+
+# Arrow types of the columns added to Parquet output
+RESULT_TYPES = (
+    ("label", "string"),
+    ("confidence_Left", "double"),
+    ("confidence_Neutral", "double"),
+    ("confidence_Right", "double"),
+    ("gate", "string"),
+    ("reasoning", "string"),
+    ("is_model_prediction", "bool"),
+)
+
+
+def file_format(path: Path) -> str:
+    fmt = FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Unsupported file type {path} (expected one of {sorted(FORMATS)})")
+    return fmt
+
+
+class BulkScorer:
+    """
+    Score a headline file into an output file, resumably.
+
+    Usage:
+        scorer = BulkScorer("headlines.csv", "scored.parquet", model_type="nli", workers=4)
+        summary = scorer.run()   # re-run after a crash to resume
+        # {"rows": ..., "chunks": ..., "skipped_chunks": ..., "gates": {...}}
+    """
+
+    def __init__(
+        self,
+        input_path,
+        output_path,
+        model_type: str = "nli",
+        workers: int = 1,
+        chunk_size: int = SCORE_CHUNK_SIZE,
+        column: str = "headline",
+        batch_size: int = PREDICT_BATCH_SIZE,
+    ) -> None:
+        self.input_path = Path(input_path)
+        self.output_path = Path(output_path)
+        self.input_format = file_format(self.input_path)
+        self.output_format = file_format(self.output_path)
+        self.model_type = model_type
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
+        self.column = column
+        self.batch_size = batch_size
+
+        if self.output_format == "parquet":
+            self.parts_dir = self.output_path
+        else:
+            self.parts_dir = self.output_path.with_name(self.output_path.name + ".parts")
+        self.checkpoint_path = self.output_path.with_name(self.output_path.name + ".checkpoint.json")
+
+    # ── Public API ───────────────────────────────────────────
+
+    def run(self) -> dict:
+        self._prepare_checkpoint()
+        started = time.perf_counter()
+        rows, chunks, skipped, gates = 0, 0, 0, Counter()
+        self._cascade = Counter()
+        schema = None
+
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        if self.workers == 1:
+            _init_worker(self.model_type, threads, self.batch_size)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=mp.get_context(WORKER_START_METHOD),
+                initializer=_init_worker,
+                initargs=(self.model_type, threads, self.batch_size),
+            )
+
+        pending = set()
+        try:
+            for index, chunk in self._read_chunks():
+                chunks += 1
+                if schema is None and self.output_format == "parquet":
+                    schema = self._output_schema(chunk)
+                part = self._part_path(index)
+                if part.exists():
+                    skipped += 1
+                    continue
+
+                task = (index, chunk, self.column, str(part), self.output_format, schema)
+                if pool is None:
+                    n, chunk_gates, cascade = _score_chunk(*task)
+                    rows, gates = rows + n, gates + chunk_gates
+                    self._cascade += cascade
+                    self._log_progress(rows, started)
+                    continue
+
+                pending.add(pool.submit(_score_chunk, *task))
+                # Bound the chunks held in memory to a couple per worker
+                while len(pending) >= 2 * self.workers:
+                    rows, gates = self._collect(pending, rows, gates, started)
+            while pending:
+                rows, gates = self._collect(pending, rows, gates, started)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        if self.output_format != "parquet":
+            self._merge_parts(chunks)
+        self.checkpoint_path.unlink(missing_ok=True)
+
+        summary = {
+            "rows": rows,
+            "chunks": chunks,
+            "skipped_chunks": skipped,
+            "gates": dict(gates),
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+        if self.model_type == "cascade":
+            # Model calls this run (cache hits excluded), as BiasPredictor.cascade_stats
+            routed = self._cascade["baseline"] + self._cascade["nli"]
+            summary["cascade"] = {
+                "baseline": self._cascade["baseline"],
+                "nli": self._cascade["nli"],
+                "escalation_rate": round(self._cascade["nli"] / routed, 4) if routed else 0.0,
+            }
+        logger.info("Scored %s → %s: %s", self.input_path, self.output_path, summary)
+        return summary
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _collect(self, pending: set, rows: int, gates: Counter, started: float) -> Tuple[int, Counter]:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            n, chunk_gates, cascade = future.result()
+            rows, gates = rows + n, gates + chunk_gates
+            self._cascade += cascade
+        self._log_progress(rows, started)
+        return rows, gates
+
+    def _log_progress(self, rows: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        logger.info("%d rows scored this run (%.0f rows/s)", rows, rows / elapsed if elapsed else 0.0)
+
+    def _read_chunks(self) -> Iterator[Tuple[int, pd.DataFrame]]:
+        if self.input_format == "csv":
+            # Strings throughout, so passthrough columns are written back unchanged
+            reader = pd.read_csv(
+                self.input_path, chunksize=self.chunk_size, dtype=str, keep_default_na=False,
+            )
+        elif self.input_format == "jsonl":
+            reader = pd.read_json(self.input_path, lines=True, chunksize=self.chunk_size, dtype=False)
+        else:
+            import pyarrow.parquet as pq
+
+            batches = pq.ParquetFile(self.input_path).iter_batches(batch_size=self.chunk_size)
+            reader = (batch.to_pandas() for batch in batches)
+
+        for index, chunk in enumerate(reader):
+            if self.column not in chunk.columns:
+                raise KeyError(f"Column {self.column!r} not in {self.input_path} ({list(chunk.columns)})")
+            yield index, chunk.reset_index(drop=True)
+
+    def _output_schema(self, first_chunk: pd.DataFrame):
+        """Arrow schema every Parquet part is cast to."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.input_format == "parquet":
+            fields = list(pq.ParquetFile(self.input_path).schema_arrow.remove_metadata())
+        else:
+            fields = list(pa.Schema.from_pandas(first_chunk, preserve_index=False).remove_metadata())
+            # An all-null column in the first chunk says nothing about its type
+            fields = [f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in fields]
+
+        result = {name: pa.field(name, type_) for name, type_ in RESULT_TYPES}
+        fields = [result.pop(f.name, f) for f in fields]   # result columns overwrite input ones in place
+        return pa.schema(fields + list(result.values()))
+
+    def _part_path(self, index: int) -> Path:
+        return self.parts_dir / f"part-{index:06d}.{self.output_format}"
+
+    def _prepare_checkpoint(self) -> None:
+        """Record the job settings; refuse to resume parts from a different job."""
+        settings = {
+            "input": str(self.input_path.resolve()),
+            "output_format": self.output_format,
+            "model_type": self.model_type,
+            "chunk_size": self.chunk_size,
+            "column": self.column,
+        }
+        if self.checkpoint_path.exists():
+            previous = json.loads(self.checkpoint_path.read_text())
+            if previous != settings:
+                raise ValueError(
+                    f"{self.checkpoint_path} belongs to a different job ({previous}); "
+                    "delete it and the existing parts to start over"
+                )
+            done = len(list(self.parts_dir.glob(f"part-*.{self.output_format}")))
+            logger.info("Resuming: %d chunks already scored", done)
+        else:
+            # Parts left by an earlier, finished job would otherwise be "resumed"
+            for stale in self.parts_dir.glob(f"part-*.{self.output_format}"):
+                stale.unlink()
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            self.checkpoint_path.write_text(json.dumps(settings, indent=2))
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+
+    def _merge_parts(self, chunks: int) -> None:
+        tmp = self.output_path.with_name(self.output_path.name + ".tmp")
+        with open(tmp, "wb") as out:
+            for index in range(chunks):
+                with open(self._part_path(index), "rb") as part:
+                    if self.output_format == "csv" and index > 0:
+                        part.readline()  # header
+                    shutil.copyfileobj(part, out)
+        os.replace(tmp, self.output_path)
+        shutil.rmtree(self.parts_dir)
+
+
+# ── Worker process ───────────────────────────────────────────
+
+_predictor = None
+_batch_size = PREDICT_BATCH_SIZE
+
+
+def _init_worker(model_type: str, num_threads: int, batch_size: int) -> None:
+    global _predictor, _batch_size
+    pin_threads(model_type, num_threads)
+
+    from src.inference.predictor import BiasPredictor
+
+    _predictor = BiasPredictor(model_type)
+    _batch_size = batch_size
+
+
+def _score_chunk(
+    index: int, chunk: pd.DataFrame, column: str, part_path: str, fmt: str, schema=None,
+) -> Tuple[int, Counter, Counter]:
+    """
+    Score one chunk and write it atomically to ``part_path`` (Parquet
+    cast to ``schema``). Returns rows, gate counts and the cascade
+    routing counts of this chunk.
+    """
+    headlines = chunk[column].fillna("").astype(str).tolist()
+    routed_before = Counter(_predictor.cascade_stats)
+    results = _predictor.predict_batch(headlines, batch_size=_batch_size)
+    cascade = Counter(_predictor.cascade_stats)
+    cascade.subtract(routed_before)
+
+    out = chunk.copy()
+    out["label"] = [r.label for r in results]
+    if fmt == "jsonl":
+        out["confidence"] = [r.confidence for r in results]
+    else:
+        for label in ("Left", "Neutral", "Right"):
+            out[f"confidence_{label}"] = [r.confidence.get(label, 0.0) for r in results]
+    out["gate"] = [r.gate for r in results]
+    out["reasoning"] = [r.reasoning for r in results]
+    out["is_model_prediction"] = [r.is_model_prediction for r in results]
+
+    tmp = f"{part_path}.tmp"
+    if fmt == "csv":
+        out.to_csv(tmp, index=False)
+    elif fmt == "jsonl":
+        out.to_json(tmp, orient="records", lines=True, force_ascii=False)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(out, preserve_index=False)
+        pq.write_table(table.select(schema.names).cast(schema), tmp)
+    os.replace(tmp, part_path)
+
+    logger.debug("Chunk %d: %d rows → %s", index, len(out), part_path)
+    return len(out), Counter(r.gate for r in results), cascade
@@ -0,0 +1,274 @@
+"""
+Metrics – Minimal Prometheus-compatible metrics registry.
+=========================================================
+Counters, gauges and histograms that render in the Prometheus text
+exposition format for ``GET /metrics``. Each metric holds one lock and
+a dict of per-label-set values, so recording is a dict lookup and a few
+additions – cheap enough to stay on under load.
+
+Histograms can be drained and merged, which lets inference worker
+processes ship their observations back to the serving process.
+
+Inside ``collect_timings()`` every stage timed through ``STAGE_SECONDS``
+is also summed into a per-call dict, which is how BiasResult gets its
+optional timing breakdown.
+
+Usage:
+    from src.metrics import GATE_TOTAL, STAGE_SECONDS, render
+
+    GATE_TOTAL.inc(model="nli", gate="model")
+    with STAGE_SECONDS.time(model="nli", stage="forward"):
+        ...
+    text = render()
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+# Latency buckets (seconds): fine at the low end for the keyword filter,
+# up to 10s for cold model calls
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Per-call timing dict filled by collect_timings(), if one is active
+_ACTIVE_TIMINGS: ContextVar[Optional[dict]] = ContextVar("active_timings", default=None)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self) -> Iterable[Tuple[str, tuple, float]]:
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, value in self._samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Point-in-time value per label set. Either ``set`` values directly or
+    pass ``callback`` returning ``{label_values_tuple: value}``, which is
+    read at scrape time.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback: Callable[[], Dict[tuple, float]] = None) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self):
+        if self.callback is None:
+            return super()._samples()
+        return [
+            (self.name, tuple(str(v) for v in key), value)
+            for key, value in self.callback().items()
+        ]
+
+
+class CallbackCounter(Gauge):
+    """Counter whose values are owned elsewhere and read at scrape time."""
+
+    kind = "counter"
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS, collect: bool = False) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.collect = collect  # also feed collect_timings()
+
+    def observe(self, value: float, **labels) -> None:
+        self._observe(self._key(labels), value)
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager that observes the elapsed wall time of its block."""
+        return _Timer(self, self._key(labels))
+
+    def drain(self) -> dict:
+        """Return and reset all observations (for shipping across processes)."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, drained: dict) -> None:
+        """Add observations returned by another process's ``drain``."""
+        with self._lock:
+            for key, (counts, total, count) in drained.items():
+                state = self._values.get(key)
+                if state is None:
+                    self._values[key] = [list(counts), total, count]
+                    continue
+                for i, c in enumerate(counts):
+                    state[0][i] += c
+                state[1] += total
+                state[2] += count
+
+    def _observe(self, key: tuple, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, list(s[0]), s[1], s[2]) for key, s in self._values.items()]
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float("inf"),), counts):
+                cumulative += c
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return "\n".join(lines)
+
+
+class _Timer:
+    __slots__ = ("histogram", "key", "start")
+
+    def __init__(self, histogram: Histogram, key: tuple) -> None:
+        self.histogram = histogram
+        self.key = key
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.histogram._observe(self.key, elapsed)
+        if self.histogram.collect:
+            add_timings({".".join(self.key): elapsed})
+
+
+# ── Per-call timings ─────────────────────────────────────────
+
+@contextmanager
+def collect_timings() -> Iterator[dict]:
+    """
+    Sum the seconds of every collected stage timed inside the block,
+    keyed ``"<model>.<stage>"`` (e.g. ``"nli.forward"``).
+
+    Usage:
+        with collect_timings() as timings:
+            predictor.predict_batch(headlines)
+        timings  # {"nli.filter": 0.0004, "nli.tokenize": 0.002, ...}
+    """
+    timings = {}
+    token = _ACTIVE_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _ACTIVE_TIMINGS.reset(token)
+
+
+def add_timings(seconds: Dict[str, float]) -> None:
+    """Add stage seconds (e.g. measured in a worker process) to the active collector."""
+    timings = _ACTIVE_TIMINGS.get()
+    if timings is not None:
+        for stage, value in seconds.items():
+            timings[stage] = timings.get(stage, 0.0) + value
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank ``pct`` percentile of already sorted values; 0.0 when empty."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# ── Registry ─────────────────────────────────────────────────
+
+REGISTRY: list = []
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text format."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+# ── Inference metrics ────────────────────────────────────────
+
+GATE_TOTAL = Counter(
+    "bias_gate_total",
+    "Headlines routed by each gate (non_political, neutral_political, model).",
+    ("model", "gate"),
+)
+STAGE_SECONDS = Histogram(
+    "bias_stage_seconds",
+    "Latency per pipeline stage: filter is per headline; tokenize, forward "
+    "and aggregate are per model batch, labelled with the backend that ran.",
+    ("model", "stage"),
+    collect=True,
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "bias_model_load_seconds",
+    "Seconds taken to load each model backend.",
+    ("model",),
+)
@@ -5,11 +5,23 @@ Two-gate system that filters headlines before they reach the ML model:
   Gate 1: Non-political content → immediately classified as Neutral
   Gate 2: Political but unbiased → classified as Neutral
   Gate 3: Politically biased → forwarded to BERT for Left/Right/Neutral
+
+Each keyword list compiles to one regex: the keywords are merged into a
+character trie and emitted as nested alternations, so a headline is
+scanned once per gate instead of once per keyword. Matching keeps the
+``\\bkeyword\\b`` semantics of matching each keyword on its own.
+
+``classify_many`` runs the same patterns column-wise over a pandas
+Series or Arrow array with pyarrow's RE2 kernels.
 """
 
 import re
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import List
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class FilterResult(Enum):
@@ -19,6 +31,19 @@ class FilterResult(Enum):
     BIASED_POLITICAL = "biased_political"
 
 
+# classify_many code → FilterResult (codes are positions in this tuple)
+FILTER_RESULTS = tuple(FilterResult)
+_CODES = {result: code for code, result in enumerate(FILTER_RESULTS)}
+
+
+@dataclass
+class FilterMatch:
+    """A classification with the keywords behind it."""
+    result: FilterResult
+    non_political: List[str] = field(default_factory=list)
+    political: List[str] = field(default_factory=list)
+
+
 class PoliticalFilter:
     """
     Word-boundary-aware keyword filter for Indian news headlines.
@@ -27,6 +52,8 @@ class PoliticalFilter:
         pf = PoliticalFilter()
         result = pf.classify("Hyderabad weather forecast for tomorrow")
         # → FilterResult.NON_POLITICAL
+        pf.match("Hyderabad weather forecast for tomorrow").non_political
+        # → ["weather", "forecast"]
     """
 
     # ── Non-political topics (Gate 1) ────────────────────────
@@ -114,9 +141,9 @@ class PoliticalFilter:
     ]
 
     def __init__(self) -> None:
-        """Pre-compile regex patterns for performance."""
-        self._non_political_patterns = self._compile(self.NON_POLITICAL_KEYWORDS)
-        self._political_patterns = self._compile(self.POLITICAL_KEYWORDS)
+        """Pre-compile one combined pattern per gate."""
+        self._non_political = _KeywordMatcher(self.NON_POLITICAL_KEYWORDS)
+        self._political = _KeywordMatcher(self.POLITICAL_KEYWORDS)
 
     # ── Public API ───────────────────────────────────────────
 
@@ -131,30 +158,167 @@ class PoliticalFilter:
         """
         text = headline.lower()
 
-        if self._matches(text, self._non_political_patterns):
+        if self._non_political.search(text):
             return FilterResult.NON_POLITICAL
 
-        if not self._matches(text, self._political_patterns):
+        if not self._political.search(text):
             return FilterResult.NEUTRAL_POLITICAL
 
         return FilterResult.BIASED_POLITICAL
 
+    def match(self, headline: str) -> FilterMatch:
+        """
+        Classify a headline and report every keyword of each list found in
+        it, in order of appearance. ``result`` always equals ``classify``.
+        """
+        text = headline.lower()
+        non_political = self._non_political.find_all(text)
+        political = self._political.find_all(text)
+        if non_political:
+            result = FilterResult.NON_POLITICAL
+        elif not political:
+            result = FilterResult.NEUTRAL_POLITICAL
+        else:
+            result = FilterResult.BIASED_POLITICAL
+        return FilterMatch(result, non_political, political)
+
+    def classify_many(self, headlines) -> "np.ndarray":
+        """
+        ``classify`` over a whole column: a pandas Series, Arrow array or
+        list of strings. Returns int8 codes indexing ``FILTER_RESULTS``;
+        nulls count as empty headlines.
+
+        ASCII rows are lowercased and matched by Arrow kernels without
+        touching Python. Other rows are lowercased with ``str.lower`` (its
+        case mapping differs from Arrow's). RE2's ``\\b`` is ASCII-only, so
+        next to a non-ASCII letter it can only over-match; the non-ASCII
+        rows it matches are confirmed with Python's ``re``, which keeps
+        every row identical to ``classify``.
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if isinstance(headlines, (pa.Array, pa.ChunkedArray)):
+            array = headlines.cast(pa.string())
+        else:
+            array = pa.array(headlines, type=pa.string(), from_pandas=True)
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        array = pc.fill_null(array, "")
+
+        lowered = pc.ascii_lower(array)
+        others = pc.invert(pc.string_is_ascii(array))
+        if pc.any(others).as_py():
+            rest = [h.lower() for h in array.filter(others).to_pylist()]
+            lowered = pc.replace_with_mask(lowered, others, pa.array(rest, type=pa.string()))
+        others = _to_numpy(others)
+
+        non_political = self._non_political.search_many(lowered, others)
+        political = self._political.search_many(lowered, others)
+        return np.where(
+            non_political,
+            _CODES[FilterResult.NON_POLITICAL],
+            np.where(
+                political,
+                _CODES[FilterResult.BIASED_POLITICAL],
+                _CODES[FilterResult.NEUTRAL_POLITICAL],
+            ),
+        ).astype(np.int8)
+
     def is_non_political(self, text: str) -> bool:
         """Legacy compatibility: returns True if headline is non-political."""
         return self.classify(text) == FilterResult.NON_POLITICAL
 
     def is_political(self, text: str) -> bool:
         """Legacy compatibility: returns True if headline contains political keywords."""
-        return self._matches(text.lower(), self._political_patterns)
+        return self._political.search(text.lower())
+
+
+# ── Internals ────────────────────────────────────────────────
+
+class _KeywordMatcher:
+    """
+    ``\\b(?:kw1|kw2|...)\\b`` over a keyword list, built as a trie regex.
+
+    Regex backtracking tries every alternative before giving up at a
+    position, so ``search`` succeeds exactly when some ``\\bkw\\b`` would.
+    ``find_all`` uses a lookahead to report the longest keyword at every
+    position (overlaps included); shorter keywords that are whole-word
+    prefixes of it, like "income tax" in "income tax department", are
+    implied by that match and added from a precomputed table.
+    """
+
+    def __init__(self, keywords: List[str]) -> None:
+        self.keywords = list(dict.fromkeys(keywords))
+        for kw in self.keywords:
+            # What lets search_many trust RE2's ASCII-only \b
+            if not (kw.isascii() and _is_word_char(kw[0]) and _is_word_char(kw[-1])):
+                raise ValueError(f"Keyword {kw!r} must be ASCII and start and end with a word character")
+        body = _trie_regex(self.keywords)
+        self.pattern = rf"\b(?:{body})\b"  # also valid RE2, for ASCII text
+        self._search = re.compile(self.pattern).search
+        self._finditer = re.compile(rf"\b(?=({body})\b)").finditer
+        self._implied: Dict[str, List[str]] = {
+            kw: [
+                short for short in self.keywords
+                if len(short) < len(kw) and kw.startswith(short)
+                and _is_word_char(kw[len(short) - 1]) != _is_word_char(kw[len(short)])
+            ]
+            for kw in self.keywords
+        }
+
+    def search(self, text: str) -> bool:
+        return self._search(text) is not None
+
+    def search_many(self, lowered, non_ascii: "np.ndarray") -> "np.ndarray":
+        """
+        ``search`` over an Arrow string array, as a boolean mask. Where
+        ``non_ascii`` is set, RE2's matches are re-checked in Python.
+        """
+        import numpy as np
+        import pyarrow.compute as pc
+
+        found = _to_numpy(pc.match_substring_regex(lowered, self.pattern))
+        for i in np.flatnonzero(found & non_ascii):
+            found[i] = self.search(lowered[int(i)].as_py())
+        return found
+
+    def find_all(self, text: str) -> List[str]:
+        found = {}
+        for m in self._finditer(text):
+            for kw in (*self._implied[m.group(1)], m.group(1)):
+                found.setdefault(kw, None)
+        return list(found)
+
+
+def _to_numpy(mask) -> "np.ndarray":
+    import numpy as np
+
+    return np.array(mask.to_numpy(zero_copy_only=False), dtype=bool)
+
+
+def _is_word_char(char: str) -> bool:
+    return re.match(r"\w", char) is not None
+
 
-    # ── Internals ────────────────────────────────────────────
+def _trie_regex(keywords: List[str]) -> str:
+    """Nested alternation of ``keywords``, sharing common prefixes."""
+    trie: dict = {}
+    for kw in keywords:
+        node = trie
+        for char in kw:
+            node = node.setdefault(char, {})
+        node[""] = {}  # end of keyword
 
-    @staticmethod
-    def _compile(keywords: List[str]) -> list:
-        """Pre-compile word-boundary regex patterns."""
-        return [re.compile(r"\b" + re.escape(kw) + r"\b") for kw in keywords]
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A keyword ends here; longer ones continue (greedy, backtracks on \b)
+            body = f"(?:{body})?" if len(branches) == 1 else body + "?"
+        return body
 
-    @staticmethod
-    def _matches(text: str, patterns: list) -> bool:
-        """Return True if any compiled pattern matches."""
-        return any(p.search(text) for p in patterns)
+    return emit(trie)
@@ -0,0 +1,139 @@
+"""
+RequestProfiler – On-demand cProfile / torch.profiler capture.
+==============================================================
+Profiles the next N calls that pass through it, then writes one trace
+file and switches itself off:
+
+  cprofile – ``<dir>/<name>-<timestamp>.prof`` (pstats; open with
+             snakeviz or ``python -m pstats``); the top functions by
+             cumulative time are also logged.
+  torch    – ``<dir>/<name>-<timestamp>.json`` Chrome trace of torch
+             operators (chrome://tracing or Perfetto).
+
+cProfile only sees the thread it is enabled in, so one call is profiled
+at a time; calls that overlap an active capture run unprofiled.
+torch.profiler records every thread for the whole capture window.
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from config import PROFILE_DIR, PROFILE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+PROFILER_KINDS = ("cprofile", "torch")
+
+
+class RequestProfiler:
+    """
+    Capture a profile over the next ``requests`` calls.
+
+    Usage:
+        profiler = RequestProfiler("cprofile", requests=20, name="nli")
+        predict_batch = profiler.wrap(predictor.predict_batch)
+        ...                       # trace written after 20 calls
+        profiler.path             # where it went (None until then)
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        requests: int = PROFILE_REQUESTS,
+        out_dir=PROFILE_DIR,
+        name: str = "requests",
+    ) -> None:
+        if kind not in PROFILER_KINDS:
+            raise ValueError(f"Unknown profiler {kind!r} (expected one of {PROFILER_KINDS})")
+        self.kind = kind
+        self.requests = requests
+        self.out_dir = Path(out_dir)
+        self.name = name
+        self.path: Optional[Path] = None
+        self.captured = 0
+
+        self._lock = threading.Lock()
+        self._profile = None
+        self._busy = False   # cProfile: a call is being profiled right now
+        self._started = 0    # torch: calls entered during the capture
+
+    @property
+    def done(self) -> bool:
+        return self.path is not None
+
+    # ── Public API ───────────────────────────────────────────
+
+    def wrap(self, fn: Callable) -> Callable:
+        """Return ``fn`` profiled until the capture is complete."""
+        @wraps(fn)
+        def profiled(*args, **kwargs):
+            if self.done:
+                return fn(*args, **kwargs)
+            token = self._enter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._exit(token)
+        return profiled
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _enter(self) -> bool:
+        with self._lock:
+            if self.done:
+                return False
+            if self.kind == "cprofile":
+                if self._busy:
+                    return False
+                self._busy = True
+                if self._profile is None:
+                    self._profile = cProfile.Profile()
+                self._profile.enable()
+                return True
+
+            if self._started >= self.requests:
+                return False
+            if self._profile is None:
+                from torch.profiler import ProfilerActivity, profile
+
+                self._profile = profile(activities=[ProfilerActivity.CPU], record_shapes=True)
+                self._profile.__enter__()
+            self._started += 1
+            return True
+
+    def _exit(self, token: bool) -> None:
+        if not token:
+            return
+        with self._lock:
+            if self.kind == "cprofile":
+                self._profile.disable()
+                self._busy = False
+            self.captured += 1
+            if self.captured >= self.requests:
+                self._dump()
+
+    def _dump(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if self.kind == "cprofile":
+            path = self.out_dir / f"{self.name}-{stamp}.prof"
+            self._profile.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(15)
+            logger.info("cProfile top functions over %d calls:\n%s", self.captured, summary.getvalue())
+        else:
+            path = self.out_dir / f"{self.name}-{stamp}.json"
+            self._profile.__exit__(None, None, None)
+            self._profile.export_chrome_trace(str(path))
+        self._profile = None
+        self.path = path
+        logger.info("Profile of %d %s calls → %s", self.captured, self.name, path)
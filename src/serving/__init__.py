@@ -0,0 +1 @@
+"""Serving module – request batching and scheduling for the API."""
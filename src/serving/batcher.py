@@ -0,0 +1,264 @@
+"""
+MicroBatcher – Dynamic micro-batching for async request handlers.
+=================================================================
+Concurrent callers submit single headlines; a background task groups
+them into one ``predict_batch`` call. A batch closes when it reaches
+``max_batch_size`` or when its oldest request has waited
+``max_wait_ms``. Up to ``max_concurrency`` batches run at once (one per
+inference worker); requests that arrive while every slot is busy form
+the next batch. The forward pass runs in a worker thread so the event
+loop stays responsive.
+
+Callers submitting a headline whose ``key`` is already queued or
+running share that single in-flight prediction instead of adding a
+duplicate to the batch.
+
+The queue is bounded by ``max_queue``: once it is full ``submit`` raises
+``QueueFullError`` straight away instead of letting requests pile up;
+``submit_many`` admits and queues a whole bulk request in one step.
+``estimated_wait`` predicts how long a new request would take from the
+queue depth and recent batch times.
+"""
+
+import asyncio
+import logging
+import math
+import statistics
+import time
+from collections import Counter, deque
+from typing import Callable, List, Optional
+
+import sys, os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from src.metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """The batcher's queue is at ``max_queue``; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent predictions into batched model calls.
+
+    Usage:
+        batcher = MicroBatcher(predictor.predict_batch, max_batch_size=16, max_wait_ms=5)
+        result = await batcher.submit("Opposition criticizes govt on farm laws")
+        batcher.stats()  # batch sizes, queue wait percentiles, queue depth, coalesced
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[str]], list],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        name: str = "",
+        max_concurrency: int = 1,
+        key: Optional[Callable[[str], str]] = None,
+        max_queue: int = 0,
+    ) -> None:
+        self.predict_batch = predict_batch
+        self.key = key or (lambda headline: headline)
+        self.max_queue = max_queue  # 0 = unbounded
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._dispatches: set = set()   # running _dispatch tasks; the loop only holds them weakly
+        self._inflight = {}   # key → [future, waiters]
+
+        # Stats
+        self.batches = 0
+        self.items = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.batch_sizes: Counter = Counter()
+        self._waits: deque = deque(maxlen=2048)       # seconds spent queued
+        self._batch_times: deque = deque(maxlen=256)  # seconds per predict_batch
+
+    # ── Public API ───────────────────────────────────────────
+
+    async def submit(self, headline: str):
+        """
+        Queue one headline (or join an identical in-flight one) and wait
+        for its result. Raises QueueFullError when the queue is full.
+        """
+        return await self._wait(self._enqueue([headline])[0])
+
+    def submit_many(self, headlines: List[str]) -> list:
+        """
+        Queue every headline, or none of them: raises QueueFullError
+        unless all the new ones fit. Returns one awaitable result per
+        headline. Admission and enqueueing never yield to the event loop,
+        so concurrent bulk requests cannot together overfill the queue.
+        """
+        return [self._wait(entry) for entry in self._enqueue(headlines)]
+
+    def admit(self, count: int) -> None:
+        """Raise QueueFullError unless ``count`` more headlines fit in the queue."""
+        if self.max_queue and self.queue_depth + count > self.max_queue:
+            self.rejected += count
+            raise QueueFullError(
+                f"{self.name or 'model'} queue is full ({self.queue_depth}/{self.max_queue})",
+                retry_after=max(1.0, self.estimated_wait()),
+            )
+
+    def estimated_wait(self, extra: int = 1) -> float:
+        """
+        Seconds until ``extra`` newly queued headlines would have their
+        results: the batches ahead of them, run ``max_concurrency`` at a
+        time at the recent mean batch duration. 0.0 until a batch has run.
+        """
+        if not self._batch_times:
+            return 0.0
+        batches = math.ceil((self.queue_depth + extra) / self.max_batch_size)
+        rounds = math.ceil(batches / self.max_concurrency)
+        return self.max_wait + rounds * statistics.fmean(self._batch_times)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        waits_ms = sorted(w * 1000 for w in self._waits)
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queue_wait_ms": {
+                "p50": round(percentile(waits_ms, 50), 2),
+                "p95": round(percentile(waits_ms, 95), 2),
+                "max": round(waits_ms[-1], 2) if waits_ms else 0.0,
+            },
+            "mean_batch_ms": round(statistics.fmean(self._batch_times) * 1000, 2) if self._batch_times else 0.0,
+            "queue_depth": self.queue_depth,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "estimated_wait_ms": round(self.estimated_wait() * 1000, 2),
+        }
+
+    async def close(self) -> None:
+        """Stop batching; every caller still waiting fails instead of hanging."""
+        tasks = [task for task in (self._task, *self._dispatches) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._dispatches.clear()
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        # Queued, batched and in-flight headlines all still have an entry here
+        error = RuntimeError(f"{self.name or 'model'} batcher closed")
+        for future, _ in list(self._inflight.values()):
+            if not future.done():
+                future.set_exception(error)
+        self._inflight.clear()
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _enqueue(self, headlines: List[str]) -> list:
+        """Admit and queue the headlines not already in flight; their entries, in order."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._task = asyncio.create_task(self._run(), name=f"batcher-{self.name}")
+
+        keys = [self.key(headline) for headline in headlines]
+        new = {
+            key for key in keys
+            if key not in self._inflight or self._inflight[key][0].cancelled()
+        }
+        self.admit(len(new))
+
+        loop = asyncio.get_running_loop()
+        now = time.perf_counter()
+        entries = []
+        for headline, key in zip(headlines, keys):
+            entry = self._inflight.get(key)
+            if entry is not None and not entry[0].cancelled():
+                self.coalesced += 1
+            else:
+                entry = self._inflight[key] = [loop.create_future(), 0]   # [future, waiters]
+                entry[0].add_done_callback(lambda _, key=key, entry=entry: self._forget(key, entry))
+                self._queue.put_nowait((headline, entry[0], now))
+            entry[1] += 1
+            entries.append(entry)
+        return entries
+
+    async def _wait(self, entry: list):
+        # Shielded so one caller giving up does not cancel the others; the
+        # prediction is only dropped once every waiter has gone.
+        try:
+            return await asyncio.shield(entry[0])
+        except asyncio.CancelledError:
+            entry[1] -= 1
+            if entry[1] == 0:
+                entry[0].cancel()
+            raise
+
+    def _forget(self, key: str, entry: list) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            closes_at = batch[0][2] + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                # Take whatever is already queued, then wait out the window
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = closes_at - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Drop callers that gave up while queued
+            batch = [item for item in batch if not item[1].done()]
+            if batch:
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+            else:
+                self._slots.release()
+
+    async def _dispatch(self, batch: list) -> None:
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            self._waits.append(started - enqueued)
+
+        try:
+            results = await asyncio.to_thread(self.predict_batch, [h for h, _, _ in batch])
+        except Exception as exc:
+            logger.exception("Batch of %d failed", len(batch))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+        self._batch_times.append(time.perf_counter() - started)
+        self.batches += 1
+        self.items += len(batch)
+        self.batch_sizes[len(batch)] += 1
+        self._slots.release()
@@ -0,0 +1,152 @@
+"""
+Prefork server – N uvicorn workers sharing one copy of the model weights.
+=========================================================================
+``uvicorn --workers N`` starts N fresh interpreters, each loading its
+own copy of the NLI weights. Here the parent loads the preloaded models
+once (without running inference, so no torch thread pools exist yet),
+freezes the GC, binds the listening socket and then forks the workers.
+
+Each child inherits the weights copy-on-write. Inference only reads
+the parameter tensors, so those pages stay shared. Each child then
+warms up and serves requests on the shared socket as usual. The parent
+only supervises: it re-forks workers that die and forwards SIGTERM and
+SIGINT.
+
+Inline execution mode only. In process mode the weights live in the
+inference worker pool, not in the app process.
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import APP_PRELOAD_MODELS, SERVE_EXECUTION_MODE
+
+logger = logging.getLogger(__name__)
+
+
+class PreforkServer:
+    """
+    Preload models, then fork uvicorn workers on a shared socket.
+
+    Usage:
+        PreforkServer(host="0.0.0.0", port=8000, workers=4).run()  # blocks
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 2,
+        models: list = None,
+    ) -> None:
+        if SERVE_EXECUTION_MODE != "inline":
+            raise ValueError("Prefork serving needs BIAS_EXECUTION_MODE=inline")
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.models = APP_PRELOAD_MODELS if models is None else models
+        self._children = {}   # pid → worker index
+        self._stopping = False
+
+    # ── Public API ───────────────────────────────────────────
+
+    def run(self) -> None:
+        gc.disable()  # no collections while the shared heap is being built
+        self._preload()
+        sock = self._bind()
+
+        # Move everything allocated so far into the permanent generation,
+        # so the children's GC never touches (and un-shares) those pages
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        for index in range(self.workers):
+            self._spawn(index, sock)
+        logger.info(
+            "Serving on http://%s:%d with %d forked workers", self.host, self.port, self.workers
+        )
+        self._supervise(sock)
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _preload(self) -> None:
+        from src.app import get_predictor
+
+        for model_type in self.models:
+            start = time.perf_counter()
+            predictor = get_predictor(model_type)
+            predictor._load_model()
+            if model_type == "cascade":
+                predictor._load_backend("nli")  # share the escalation model too
+            logger.info("Loaded %s weights in the parent in %.1fs", model_type, time.perf_counter() - start)
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, index: int, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            return
+
+        # ── Child ──
+        code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            gc.enable()
+            self._serve(sock)
+        except BaseException:
+            logger.exception("Worker %d crashed", index)
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _serve(self, sock: socket.socket) -> None:
+        import uvicorn
+        from src.app import app, predictors
+
+        # SQLite connections must not cross fork(); give each child its own
+        for predictor in predictors.values():
+            predictor.cache.reopen()
+
+        config = uvicorn.Config(app, host=self.host, port=self.port, log_level="info")
+        uvicorn.Server(config).run(sockets=[sock])
+
+    def _supervise(self, sock: socket.socket) -> None:
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            logger.error(
+                "Worker %d (pid %d) exited with status %d – re-forking",
+                index, pid, os.waitstatus_to_exitcode(status),
+            )
+            self._spawn(index, sock)
+        sock.close()
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
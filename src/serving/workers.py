@@ -0,0 +1,316 @@
+"""
+WorkerPool – Model inference in dedicated worker processes.
+===========================================================
+Each worker process loads its own copy of one model type, pins its
+intra-op thread count, and serves ``predict_batch`` tasks from its own
+queue. The parent dispatches to the least-busy worker and a collector
+thread routes results back to per-task futures.
+
+Workers drain their stage-latency histograms into every result so
+``/metrics`` and per-request timings in the serving process cover the
+model stages too.
+
+The collector also watches worker liveness: a dead worker is replaced,
+and its in-flight tasks are retried once on the replacement before
+failing with ``WorkerCrashedError``.
+
+``PooledPredictor`` is a BiasPredictor whose model stage runs on a
+WorkerPool, so gating and caching stay in the serving process.
+"""
+
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+from config import PROFILE_MODE, WARMUP_HEADLINES
+from src.inference.backends import WORKER_START_METHOD, pin_threads
+from src.inference.predictor import BiasPredictor, BiasResult
+from src.metrics import MODEL_LOAD_SECONDS, STAGE_SECONDS, add_timings
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerCrashedError(RuntimeError):
+    """A worker process died while holding a task (after one retry)."""
+
+
+def _worker_main(worker_id: int, model_type: str, num_threads: int, warmup_headlines, tasks, results) -> None:
+    """Worker process entry point: load the model, then serve tasks until None."""
+    pin_threads(model_type, num_threads)
+
+    from src.inference.cache import PredictionCache
+
+    try:
+        start = time.perf_counter()
+        predictor = BiasPredictor(model_type, cache=PredictionCache(max_entries=0))
+        predictor._load_model()
+        load_seconds = time.perf_counter() - start
+        predictor.warmup(warmup_headlines)
+    except Exception as exc:
+        results.put((worker_id, "ready", None, f"{type(exc).__name__}: {exc}"))
+        return
+    STAGE_SECONDS.drain()  # warmup timings are not traffic
+    results.put((worker_id, "ready", load_seconds, None))
+
+    predict = predictor._predict_model_batch
+    if PROFILE_MODE:
+        # The model work happens here, so this is where BIAS_PROFILE captures it
+        from src.profiling import RequestProfiler
+        predict = RequestProfiler(PROFILE_MODE, name=f"{model_type}-worker{worker_id}-batches").wrap(predict)
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, headlines = task
+        try:
+            batch = predict(headlines)
+            results.put((worker_id, task_id, (batch, STAGE_SECONDS.drain()), None))
+        except Exception as exc:
+            results.put((worker_id, task_id, None, f"{type(exc).__name__}: {exc}"))
+
+
+class WorkerPool:
+    """
+    Pool of model-holding worker processes.
+
+    Usage:
+        pool = WorkerPool("nli", num_workers=2, threads_per_worker=2)
+        pool.wait_ready()
+        results = pool.predict_batch(headlines)  # blocking, thread-safe
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        model_type: str,
+        num_workers: int = 2,
+        threads_per_worker: int = 0,
+        warmup_headlines: List[str] = WARMUP_HEADLINES,
+    ) -> None:
+        self.model_type = model_type
+        self.warmup_headlines = list(warmup_headlines)
+        self.num_workers = max(1, num_workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.num_workers)
+        self.restarts = 0
+
+        self._ctx = mp.get_context(WORKER_START_METHOD)
+        self._results = self._ctx.Queue()
+        self._lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._inflight = {}   # task_id → [worker_id, headlines, future, attempts]
+        self._load = [0] * self.num_workers
+        self._ready = [threading.Event() for _ in range(self.num_workers)]
+        self._load_errors = {}
+        self._procs = [None] * self.num_workers
+        self._queues = [None] * self.num_workers
+        self._closed = False
+
+        for worker_id in range(self.num_workers):
+            self._start_worker(worker_id)
+        logger.info(
+            "Started %d %s workers × %d threads",
+            self.num_workers, model_type, self.threads_per_worker,
+        )
+
+        self._collector = threading.Thread(target=self._collect, name="worker-pool-collector", daemon=True)
+        self._collector.start()
+
+    # ── Public API ───────────────────────────────────────────
+
+    def wait_ready(self, timeout: float | None = None) -> None:
+        """Block until every worker has loaded and warmed up its model."""
+        for event in self._ready:
+            if not event.wait(timeout):
+                raise TimeoutError(f"{self.model_type} workers not ready after {timeout}s")
+        if self._load_errors:
+            raise RuntimeError(f"{self.model_type} workers failed to load: {self._load_errors}")
+
+    def submit(self, headlines: List[str]) -> Future:
+        """Queue a batch; the future resolves to (results, drained stage histograms)."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.model_type} worker pool is closed")
+            healthy = [w for w in range(self.num_workers) if w not in self._load_errors]
+            if not healthy:
+                raise RuntimeError(f"No {self.model_type} worker could load the model: {self._load_errors}")
+            task_id = next(self._task_ids)
+            worker_id = min(healthy, key=self._load.__getitem__)
+            self._inflight[task_id] = [worker_id, headlines, future, 1]
+            self._load[worker_id] += 1
+            self._queues[worker_id].put((task_id, headlines))
+        return future
+
+    def predict_batch(self, headlines: List[str]) -> List[BiasResult]:
+        batch, stage_seconds = self.submit(headlines).result()
+        # Merged here, in the caller's thread, so per-request timing collectors see them
+        STAGE_SECONDS.merge(stage_seconds)
+        add_timings({".".join(key): state[1] for key, state in stage_seconds.items()})
+        return batch
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.num_workers,
+                "threads_per_worker": self.threads_per_worker,
+                "alive": sum(p.is_alive() for p in self._procs),
+                "restarts": self.restarts,
+                "inflight": len(self._inflight),
+            }
+
+    def close(self) -> None:
+        """Stop the workers; tasks still in flight fail instead of hanging."""
+        with self._lock:
+            self._closed = True
+        for q in self._queues:
+            q.put(None)
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+
+        # The collector has stopped, so nothing else resolves these now
+        with self._lock:
+            orphaned, self._inflight = self._inflight, {}
+            self._load = [0] * self.num_workers
+        for _, _, future, _ in orphaned.values():
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.model_type} worker pool closed"))
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _start_worker(self, worker_id: int) -> None:
+        self._ready[worker_id].clear()
+        self._queues[worker_id] = self._ctx.Queue()
+        self._procs[worker_id] = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.model_type, self.threads_per_worker, self.warmup_headlines,
+                  self._queues[worker_id], self._results),
+            name=f"bias-worker-{self.model_type}-{worker_id}",
+            daemon=True,
+        )
+        self._procs[worker_id].start()
+
+    def _collect(self) -> None:
+        last_check = time.monotonic()
+        while not self._closed:
+            if time.monotonic() - last_check >= 0.5:
+                self._check_workers()
+                last_check = time.monotonic()
+            try:
+                worker_id, task_id, results, error = self._results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            if task_id == "ready":
+                if error:
+                    logger.error("Worker %d failed to load %s: %s", worker_id, self.model_type, error)
+                    self._fail_worker_tasks(worker_id, error)
+                else:
+                    MODEL_LOAD_SECONDS.set(results, model=self.model_type)
+                self._ready[worker_id].set()
+                continue
+
+            with self._lock:
+                entry = self._inflight.pop(task_id, None)
+                if entry is None:
+                    continue
+                self._load[entry[0]] -= 1
+            future = entry[2]
+            if error:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(results)
+
+    def _fail_worker_tasks(self, worker_id: int, error: str) -> None:
+        with self._lock:
+            self._load_errors[worker_id] = error
+            orphaned = [tid for tid, e in self._inflight.items() if e[0] == worker_id]
+            for task_id in orphaned:
+                self._inflight.pop(task_id)[2].set_exception(RuntimeError(error))
+            self._load[worker_id] = 0
+
+    def _check_workers(self) -> None:
+        for worker_id, proc in enumerate(self._procs):
+            if proc.is_alive() or self._closed or worker_id in self._load_errors:
+                continue
+
+            logger.error(
+                "Worker %d (%s) died with exit code %s – restarting",
+                worker_id, self.model_type, proc.exitcode,
+            )
+            self.restarts += 1
+            with self._lock:
+                self._start_worker(worker_id)
+                self._load[worker_id] = 0
+                orphaned = [(tid, e) for tid, e in self._inflight.items() if e[0] == worker_id]
+                for task_id, entry in orphaned:
+                    if entry[3] >= 2:
+                        del self._inflight[task_id]
+                        entry[2].set_exception(
+                            WorkerCrashedError(f"{self.model_type} worker {worker_id} crashed twice on this batch")
+                        )
+                        continue
+                    # Retry once on the replacement worker
+                    entry[3] += 1
+                    self._load[worker_id] += 1
+                    self._queues[worker_id].put((task_id, entry[1]))
+
+
+class PooledPredictor(BiasPredictor):
+    """
+    BiasPredictor that gates and caches in-process but runs the model
+    stage on a WorkerPool.
+
+    Usage:
+        predictor = PooledPredictor("nli", num_workers=2, threads_per_worker=2)
+        predictor.warmup()  # starts workers and waits for them
+        predictor.predict_batch(headlines)
+    """
+
+    def __init__(self, model_type: str = "nli", num_workers: int = 2, threads_per_worker: int = 0, **kwargs) -> None:
+        super().__init__(model_type, **kwargs)
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker
+        self.pool: WorkerPool | None = None
+        self._pool_lock = threading.Lock()
+
+    def _load_model(self, warmup_headlines: List[str] = WARMUP_HEADLINES) -> bool:
+        """Start the pool unless it is running; True if this call started it."""
+        with self._pool_lock:
+            if self.pool is not None:
+                return False
+            self.pool = WorkerPool(
+                self.model_type, self.num_workers, self.threads_per_worker, warmup_headlines,
+            )
+            return True
+
+    def warmup(self, headlines: List[str] = WARMUP_HEADLINES) -> None:
+        """
+        Start the workers, each of which loads its model and warms it up
+        on ``headlines``. If the pool was already running, ``headlines``
+        are run once on every worker instead.
+        """
+        started = self._load_model(headlines)
+        self.pool.wait_ready()
+        if not started:
+            # Idle workers are picked least-busy first, so each gets one batch
+            futures = [self.pool.submit(headlines) for _ in range(self.pool.num_workers)]
+            for future in futures:
+                future.result()   # stage timings dropped: warmup is not traffic
+
+    def _predict_model_batch(self, headlines: List[str]) -> List[BiasResult]:
+        return self.pool.predict_batch(headlines)
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
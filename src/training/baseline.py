@@ -10,11 +10,9 @@ import json
 import logging
 
 import joblib
-import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, confusion_matrix
-from sklearn.model_selection import train_test_split
 
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -22,11 +20,11 @@ from config import (
     BASELINE_MODEL,
     BASELINE_TFIDF,
     MODELS_DIR,
-    PROCESSED_CSV,
+    PROCESSED_DATASET,
     TFIDF_MAX_FEATURES,
     TFIDF_NGRAM_RANGE,
-    map_5_to_3,
 )
+from src.data.dataset import load_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -42,37 +40,27 @@ class BaselineTrainer:
 
     def __init__(
         self,
-        data_path=PROCESSED_CSV,
+        data_path=PROCESSED_DATASET,
         max_features: int = TFIDF_MAX_FEATURES,
         ngram_range: tuple = TFIDF_NGRAM_RANGE,
-        test_size: float = 0.2,
         class_weight: str = "balanced",
     ) -> None:
         self.data_path = data_path
         self.max_features = max_features
         self.ngram_range = ngram_range
-        self.test_size = test_size
         self.class_weight = class_weight
 
     def train(self) -> dict:
         """Full training pipeline. Returns classification report dict."""
-        # Load & prepare data
-        df = pd.read_csv(self.data_path)
-        df = df.dropna(subset=["clean_headline", "category"])
+        # Load data: 3-class labels and the train/test split are precomputed
+        df = load_dataset(self.data_path, columns=["clean_headline", "bias", "split"])
         df = df[df["clean_headline"].str.strip() != ""]
 
-        # Use 3-class labels
-        df["bias"] = df["category"].apply(map_5_to_3)
+        logger.info("Class distribution:\n%s", df["bias"].value_counts().to_string())
 
-        X = df["clean_headline"].astype(str)
-        y = df["bias"]
-
-        logger.info("Class distribution:\n%s", y.value_counts().to_string())
-
-        # Split
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=self.test_size, random_state=42, stratify=y
-        )
+        train, test = df[df["split"] == "train"], df[df["split"] == "test"]
+        X_train, y_train = train["clean_headline"], train["bias"]
+        X_test, y_test = test["clean_headline"], test["bias"]
 
         # Vectorize
         vectorizer = TfidfVectorizer(
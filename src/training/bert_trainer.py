@@ -8,7 +8,6 @@ integrated evaluation metrics and proper train/eval split.
 import logging
 
 import numpy as np
-import pandas as pd
 from datasets import Dataset
 from sklearn.metrics import accuracy_score, f1_score
 from transformers import (
@@ -28,10 +27,9 @@ from config import (
     BERT_MODEL_NAME,
     BERT_TRAIN_EPOCHS,
     LABEL_MAP,
-    PROCESSED_CSV,
-    map_5_to_3,
-    LABEL_MAP_INV,
+    PROCESSED_DATASET,
 )
+from src.data.dataset import SPLITS, load_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +45,7 @@ class BertTrainer:
 
     def __init__(
         self,
-        data_path=PROCESSED_CSV,
+        data_path=PROCESSED_DATASET,
         model_name: str = BERT_MODEL_NAME,
         output_dir=BERT_MODEL_DIR,
         epochs: int = BERT_TRAIN_EPOCHS,
@@ -66,20 +64,19 @@ class BertTrainer:
 
     def train(self) -> None:
         """Full training pipeline with evaluation."""
-        # Prepare data
-        df = pd.read_csv(self.data_path)
-        df = df.dropna(subset=["clean_headline", "category"])
+        # Prepare data: label ids and the train/test split are precomputed
+        df = load_dataset(self.data_path, columns=["clean_headline", "label", "split"])
         df = df[df["clean_headline"].str.strip() != ""]
-
-        df["label"] = df["category"].apply(
-            lambda x: LABEL_MAP_INV[map_5_to_3(x)]
-        )
+        df["label"] = df["label"].astype("int64")
 
         logger.info("Label distribution:\n%s", df["label"].value_counts().to_string())
 
-        dataset = Dataset.from_pandas(df[["clean_headline", "label"]])
-        dataset = dataset.map(self._tokenize, batched=True)
-        split = dataset.train_test_split(test_size=0.2, seed=42)
+        split = {
+            name: Dataset.from_pandas(
+                df.loc[df["split"] == name, ["clean_headline", "label"]], preserve_index=False
+            ).map(self._tokenize, batched=True)
+            for name in SPLITS
+        }
 
         # Model
         model = AutoModelForSequenceClassification.from_pretrained(